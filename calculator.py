@@ -8,14 +8,40 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 from datetime import datetime, timedelta
 import shutil
+import hashlib
+import gzip
+import io
+import bisect
+import sqlite3
+import threading
+import multiprocessing
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from collections import defaultdict
+from functools import lru_cache
+from contextlib import contextmanager
 import calendar
 import csv
+import itertools
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook, load_workbook
+try:
+    import zstandard  # only needed for .zst exports and imports
+except ImportError:
+    zstandard = None
 from tkcalendar import Calendar
 import tkinter.simpledialog as sd
 
 DEFAULT_STAFF = {}
+# "json" keeps staff.json (+ journal), "sqlite" stores everything in staff.db
+STORAGE_BACKEND = os.getenv("STAFFAPP_BACKEND", "json").lower()
+# Set to 0 to reject imported rows for names that are not already on the roster
+IMPORT_ALLOW_NEW_STAFF = os.getenv("STAFFAPP_IMPORT_NEW_STAFF", "1") != "0"
+# Perfect attendance for a month: hours were scheduled and tardiness/absent hours stay within these
+PERFECT_MAX_TARDINESS = float(os.getenv("STAFFAPP_PERFECT_MAX_TARDINESS", "0"))
+PERFECT_MAX_ABSENT = float(os.getenv("STAFFAPP_PERFECT_MAX_ABSENT", "0"))
 
 # ================== DATA SOURCE ==========================================
 
@@ -39,7 +65,98 @@ def get_default_json_path():
     return os.path.join(bundle_dir, "staff.json")
 
 
-def load_staff():
+# Every mutation is appended to a journal next to staff.json as one compact
+# JSON line. load_staff() replays the journal on top of the last checkpoint.
+# The checkpoint is only rewritten once the journal has grown bigger than the
+# checkpoint itself (and JOURNAL_MIN_BYTES), so rewrite cost stays proportional
+# to the amount of change.
+JOURNAL_MIN_BYTES = 1 << 20
+journal_bytes = 0
+checkpoint_bytes = 0
+
+
+def get_journal_path():
+    return os.path.splitext(get_data_path())[0] + ".journal"
+
+
+def journal_set(path, value):
+    return {"op": "set", "path": list(path), "value": value}
+
+
+def journal_delete(path):
+    return {"op": "del", "path": list(path)}
+
+
+def journal_merge(path, values):
+    # Several keys under one dict in a single record, for bulk updates
+    return {"op": "merge", "path": list(path), "value": values}
+
+
+def apply_change(data, change):
+    *parents, key = change["path"]
+    node = data
+    for part in parents:
+        node = node.setdefault(part, {})
+    if change["op"] == "del":
+        node.pop(key, None)
+    elif change["op"] == "merge":
+        node.setdefault(key, {}).update(change["value"])
+    else:
+        node[key] = change["value"]
+
+
+def replay_journal(data):
+    # Returns the number of records applied and the byte offset just past the last good one
+    journal_path = get_journal_path()
+    if not os.path.exists(journal_path):
+        return 0, 0
+    count = 0
+    good_bytes = 0
+    with open(journal_path, "rb") as f:
+        for raw in f:
+            line = raw.strip()
+            if line:
+                # A torn last line from a crash mid-write (no newline, or not valid JSON),
+                # everything before it is good
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    change = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                apply_change(data, change)
+                count += 1
+            good_bytes += len(raw)
+    return count, good_bytes
+
+
+# Reused, json.dumps with non-default arguments builds a new encoder on every call
+compact_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def encode_checkpoint(data):
+    # Compact json.dumps goes through the C encoder; indent=4 fell back to the
+    # pure-Python one and took seconds on large rosters
+    return compact_encoder.encode(data)
+
+
+def write_checkpoint(text):
+    # Write the full snapshot first, then empty the journal. Replaying a journal
+    # that is already contained in the snapshot is harmless (set/del are idempotent).
+    target_path = get_data_path()
+    tmp_path = target_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, target_path)
+    open(get_journal_path(), "w").close()
+
+
+def checkpoint_due(pending_bytes):
+    return journal_bytes + pending_bytes > max(checkpoint_bytes, JOURNAL_MIN_BYTES)
+
+
+def load_staff_json():
+    global journal_bytes, checkpoint_bytes
     target_path = get_data_path()
     if not os.path.exists(target_path):
         try:
@@ -49,13 +166,380 @@ def load_staff():
                 json.dump(DEFAULT_STAFF, f, indent=4)
     with open(target_path, "r") as f:
         print("Loading", f.name)
-        return json.load(f)
+        data = json.load(f)
+    _, good_bytes = replay_journal(data)
+    checkpoint_bytes = os.path.getsize(target_path)
+    journal_path = get_journal_path()
+    journal_bytes = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+    if journal_bytes > good_bytes:
+        # Cut off a torn tail, otherwise the next append would join it and be lost on replay
+        with open(journal_path, "r+b") as f:
+            f.truncate(good_bytes)
+        journal_bytes = good_bytes
+    if checkpoint_due(0):
+        text = encode_checkpoint(data)
+        write_checkpoint(text)
+        checkpoint_bytes, journal_bytes = len(text), 0
+    return data
+
+
+def encode_changes(changes):
+    return [compact_encoder.encode(change) for change in changes]
+
+
+def save_staff_json(changes=None):
+    # Runs on the save thread. Only the encoding needs the lock, the disk write
+    # happens after it is released. A change value encoded here may already include
+    # later edits; those edits are journaled after it, so replay still ends the same.
+    global journal_bytes, checkpoint_bytes
+    with staff_lock:
+        lines = None if changes is None else "".join(line + "\n" for line in encode_changes(changes))
+        snapshot = encode_checkpoint(staffList) if lines is None or checkpoint_due(len(lines)) else None
+    if snapshot is not None:
+        write_checkpoint(snapshot)
+        checkpoint_bytes, journal_bytes = len(snapshot), 0
+        return
+    with open(get_journal_path(), "a") as f:
+        f.write(lines)
+    journal_bytes += len(lines)
+
+
+# ================== SQLITE STORAGE ==========================================
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS staff (
+    name TEXT PRIMARY KEY,
+    current_bonus INTEGER,
+    current_chance INTEGER,
+    last_update TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS attendance (
+    name TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    scheduled REAL,
+    attended REAL,
+    tardiness REAL,
+    absent REAL,
+    PRIMARY KEY (name, week_start)
+);
+CREATE INDEX IF NOT EXISTS idx_attendance_week ON attendance (week_start, name);
+CREATE TABLE IF NOT EXISTS bonus_history (
+    name TEXT NOT NULL,
+    month TEXT NOT NULL,
+    bonus INTEGER,
+    chance INTEGER,
+    perfect INTEGER,
+    PRIMARY KEY (name, month)
+);
+CREATE TABLE IF NOT EXISTS overwrite_log (
+    name TEXT NOT NULL,
+    month TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    bonus INTEGER,
+    chance INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_overwrite_name ON overwrite_log (name, month);
+CREATE TABLE IF NOT EXISTS monthly_stats (
+    name TEXT NOT NULL,
+    month TEXT NOT NULL,
+    scheduled REAL,
+    attended REAL,
+    tardiness REAL,
+    absent REAL,
+    PRIMARY KEY (name, month)
+);
+"""
+
+STAFF_COLUMNS_KEYS = ("attendance", "monthly_stats", "bonus", "lastUpdate")
+db_conn = None
+
+
+def get_db_path():
+    return os.path.splitext(get_data_path())[0] + ".db"
+
+
+def get_db():
+    global db_conn
+    if db_conn is None:
+        # Opened on the main thread for loading, then only written from the save thread
+        db_conn = sqlite3.connect(get_db_path(), check_same_thread=False)
+        db_conn.executescript(SQLITE_SCHEMA)
+    return db_conn
+
+
+def sqlite_delete_staff(conn, name):
+    for table in ("staff", "attendance", "bonus_history", "overwrite_log", "monthly_stats"):
+        conn.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+
+
+def sqlite_write_staff(conn, name, staff):
+    sqlite_delete_staff(conn, name)
+    bonus_info = staff.get("bonus", {})
+    extra = {key: value for key, value in staff.items() if key not in STAFF_COLUMNS_KEYS}
+    conn.execute(
+        "INSERT INTO staff VALUES (?, ?, ?, ?, ?)",
+        (name, bonus_info.get("current_bonus", 0), bonus_info.get("current_chance", 0),
+         staff.get("lastUpdate"), json.dumps(extra) if extra else None)
+    )
+    conn.executemany(
+        "INSERT INTO attendance VALUES (?, ?, ?, ?, ?, ?)",
+        [(name, week, hours.get("scheduled", 0), hours.get("attended", 0), hours.get("tardiness", 0), hours.get("absent", 0))
+         for week, hours in staff.get("attendance", {}).items() if isinstance(hours, dict)]
+    )
+    if "monthly_stats" in staff:
+        conn.executemany(
+            "INSERT INTO monthly_stats VALUES (?, ?, ?, ?, ?, ?)",
+            [(name, month, totals["scheduled"], totals["attended"], totals["tardiness"], totals["absent"])
+             for month, totals in staff["monthly_stats"].items()]
+        )
+    history = bonus_info.get("bonus_history", {})
+    updated = bonus_info.get("bonus_updated", {})
+    conn.executemany(
+        "INSERT INTO bonus_history VALUES (?, ?, ?, ?, ?)",
+        [(name, month, history.get(month, {}).get("bonus"), history.get(month, {}).get("chance"),
+          None if month not in updated else int(updated[month]))
+         for month in set(history) | set(updated)]
+    )
+    conn.executemany(
+        "INSERT INTO overwrite_log VALUES (?, ?, ?, ?, ?)",
+        [(name, month, seq, record.get("bonus"), record.get("chance"))
+         for month, records in bonus_info.get("overwrite_log", {}).items()
+         for seq, record in enumerate(records)]
+    )
 
 
-def save_staff():
-    target_path = get_data_path()
-    with open(target_path, "w") as f:
-        json.dump(staffList, f, indent=4)
+def sqlite_load_all(conn):
+    data = {}
+    for name, current_bonus, current_chance, last_update, extra in conn.execute("SELECT * FROM staff"):
+        staff = json.loads(extra) if extra else {}
+        staff["attendance"] = {}
+        staff["bonus"] = {
+            "current_bonus": current_bonus,
+            "current_chance": current_chance,
+            "bonus_history": {},
+            "bonus_updated": {}
+        }
+        if last_update is not None:
+            staff["lastUpdate"] = last_update
+        data[name] = staff
+    for name, week, scheduled, attended, tardiness, absent in conn.execute("SELECT * FROM attendance"):
+        data[name]["attendance"][week] = {
+            "scheduled": scheduled,
+            "attended": attended,
+            "tardiness": tardiness,
+            "absent": absent
+        }
+    for name, month, scheduled, attended, tardiness, absent in conn.execute("SELECT * FROM monthly_stats"):
+        data[name].setdefault("monthly_stats", {})[month] = {
+            "scheduled": scheduled,
+            "attended": attended,
+            "tardiness": tardiness,
+            "absent": absent
+        }
+    for name, month, bonus, chance, perfect in conn.execute("SELECT * FROM bonus_history"):
+        bonus_info = data[name]["bonus"]
+        if bonus is not None or chance is not None:
+            bonus_info["bonus_history"][month] = {"bonus": bonus, "chance": chance}
+        if perfect is not None:
+            bonus_info["bonus_updated"][month] = bool(perfect)
+    for name, month, seq, bonus, chance in conn.execute("SELECT * FROM overwrite_log ORDER BY name, month, seq"):
+        overwrite_log = data[name]["bonus"].setdefault("overwrite_log", {})
+        overwrite_log.setdefault(month, []).append({"bonus": bonus, "chance": chance})
+    return data
+
+
+def sqlite_apply_changes(conn, changes):
+    # Attendance weeks, month totals, lastUpdate and bonus fields map onto one row; anything
+    # else rewrites that staff's rows
+    rewrite = set()
+    for change in changes:
+        path = change["path"]
+        name = path[0]
+        if len(path) == 1:
+            rewrite.discard(name)
+            if change["op"] == "del":
+                sqlite_delete_staff(conn, name)
+            else:
+                sqlite_write_staff(conn, name, change["value"])
+        elif path[1:] == ["lastUpdate"] and change["op"] == "set":
+            conn.execute("UPDATE staff SET last_update = ? WHERE name = ?", (change["value"], name))
+        elif path[1:] in (["bonus", "current_bonus"], ["bonus", "current_chance"]) and change["op"] == "set":
+            conn.execute(f"UPDATE staff SET {path[2]} = ? WHERE name = ?", (change["value"], name))
+        elif path[1:3] == ["bonus", "bonus_history"] and len(path) == 4 and change["op"] == "set":
+            conn.execute(
+                "INSERT INTO bonus_history (name, month, bonus, chance) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (name, month) DO UPDATE SET bonus = excluded.bonus, chance = excluded.chance",
+                (name, path[3], change["value"].get("bonus"), change["value"].get("chance"))
+            )
+        elif path[1:3] == ["bonus", "bonus_updated"] and len(path) == 4 and change["op"] == "set":
+            conn.execute(
+                "INSERT INTO bonus_history (name, month, perfect) VALUES (?, ?, ?) "
+                "ON CONFLICT (name, month) DO UPDATE SET perfect = excluded.perfect",
+                (name, path[3], int(change["value"]))
+            )
+        elif path[1:3] == ["bonus", "overwrite_log"] and len(path) == 4 and change["op"] == "set":
+            conn.execute("DELETE FROM overwrite_log WHERE name = ? AND month = ?", (name, path[3]))
+            conn.executemany(
+                "INSERT INTO overwrite_log VALUES (?, ?, ?, ?, ?)",
+                [(name, path[3], seq, record.get("bonus"), record.get("chance"))
+                 for seq, record in enumerate(change["value"])]
+            )
+        elif path[1:] in (["changeSeq"], ["bonusStart"]) and change["op"] == "set":
+            conn.execute(f"UPDATE staff SET extra = json_set(coalesce(extra, '{{}}'), '$.{path[1]}', json(?)) WHERE name = ?",
+                         (json.dumps(change["value"]), name))
+        elif path[1] in ("attendance", "monthly_stats") and (len(path) == 3 or change["op"] != "del"):
+            table, key = ("attendance", "week_start") if path[1] == "attendance" else ("monthly_stats", "month")
+            if change["op"] == "del":
+                conn.execute(f"DELETE FROM {table} WHERE name = ? AND {key} = ?", (name, path[2]))
+            else:
+                if len(path) == 2 and change["op"] == "set":
+                    # The whole dict replaced, e.g. the monthly cache built at startup
+                    conn.execute(f"DELETE FROM {table} WHERE name = ?", (name,))
+                rows = change["value"] if len(path) == 2 else {path[2]: change["value"]}
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?, ?)",
+                    [(name, row_key, hours.get("scheduled", 0), hours.get("attended", 0),
+                      hours.get("tardiness", 0), hours.get("absent", 0))
+                     for row_key, hours in rows.items() if isinstance(hours, dict)]
+                )
+        else:
+            rewrite.add(name)
+    for name in rewrite:
+        if name in staffList:
+            sqlite_write_staff(conn, name, staffList[name])
+
+
+def migrate_json_to_sqlite(json_path=None, db_path=None):
+    # One-shot migration of an existing staff.json (and its journal) into staff.db
+    json_path = json_path or get_data_path()
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    if json_path == get_data_path():
+        replay_journal(data)
+    conn = sqlite3.connect(db_path or get_db_path())
+    conn.executescript(SQLITE_SCHEMA)
+    with conn:
+        for name, staff in data.items():
+            sqlite_write_staff(conn, name, staff)
+    conn.close()
+    return len(data)
+
+
+def load_staff_sqlite():
+    if not os.path.exists(get_db_path()):
+        if not os.path.exists(get_data_path()):
+            load_staff_json()  # seeds staff.json from the bundled default
+        print("Migrating", get_data_path(), "to", get_db_path())
+        migrate_json_to_sqlite()
+    print("Loading", get_db_path())
+    return sqlite_load_all(get_db())
+
+
+class SqliteBatch:
+    # Stands in for the connection while staffList is locked: statements and their
+    # parameters are collected here and run on the real connection afterwards
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((False, sql, params))
+
+    def executemany(self, sql, rows):
+        self.statements.append((True, sql, rows))
+
+    def run(self, conn):
+        for many, sql, params in self.statements:
+            if many:
+                conn.executemany(sql, params)
+            else:
+                conn.execute(sql, params)
+
+
+def save_staff_sqlite(changes=None):
+    # Runs on the save thread. As in save_staff_json, only building the rows needs the
+    # lock; the writes and the commit happen after it is released
+    conn = get_db()
+    batch = SqliteBatch()
+    stored_names = [row[0] for row in conn.execute("SELECT name FROM staff")] if changes is None else []
+    with staff_lock:
+        if changes is None:
+            for name in stored_names:
+                if name not in staffList:
+                    sqlite_delete_staff(batch, name)
+            for name, staff in staffList.items():
+                sqlite_write_staff(batch, name, staff)
+        else:
+            sqlite_apply_changes(batch, changes)
+    with conn:
+        batch.run(conn)
+
+
+# ================== STORAGE ENTRY POINTS ==========================================
+
+# Bumped on every save so derived frames know when staffList has changed
+data_version = 0
+
+# staffList is only mutated on the Tk thread, always under staff_lock. Background
+# jobs hold the lock while they read it, so they never see a half-applied change.
+staff_lock = threading.RLock()
+# A single thread, so saves reach the disk in the order they were made
+save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="staffapp-save")
+# Messages from background threads to the Tk thread, drained by BackgroundWorker.poll
+ui_queue = queue.Queue()
+# Every change to a staff record stamps it with the next change sequence number
+# ("changeSeq"), so a delta export can pick out what changed since the last one
+change_seq = 0
+
+
+def load_staff():
+    if STORAGE_BACKEND == "sqlite":
+        return load_staff_sqlite()
+    return load_staff_json()
+
+
+def save_staff(changes=None):
+    # changes: list of journal_set / journal_delete records describing the mutation.
+    # Without changes the whole staffList is written out.
+    # The write itself happens on the save thread.
+    global data_version
+    data_version += 1
+    if STORAGE_BACKEND == "sqlite":
+        future = save_executor.submit(save_staff_sqlite, changes)
+    else:
+        future = save_executor.submit(save_staff_json, changes)
+    future.add_done_callback(report_save_error)
+
+
+def init_change_seq():
+    # Startup: carry on from the highest number handed out so far, deletions included.
+    # The export high-water mark counts too: tombstones at or below it are pruned, and a
+    # number reused below it would be left out of the next delta export
+    global change_seq
+    state = load_export_state()
+    stamps = [staff.get("changeSeq", 0) for staff in staffList.values()]
+    change_seq = max(stamps + list(state["deleted"].values()) + [state["high_water"], 0])
+
+
+def next_change_seq():
+    global change_seq
+    change_seq += 1
+    return change_seq
+
+
+def mark_changed(name):
+    # Tk thread, under staff_lock; returns the journal record for the new stamp
+    staffList[name]["changeSeq"] = next_change_seq()
+    return journal_set([name, "changeSeq"], staffList[name]["changeSeq"])
+
+
+def report_save_error(future):
+    if future.exception() is not None:
+        ui_queue.put(("error", Job("Save"), future.exception(), None))
+
+
+def get_month_stat(name, month):
+    return staffList[name].get("monthly_stats", {}).get(month, {})
 
 
 class DatePicker(simpledialog.Dialog):
@@ -124,8 +608,308 @@ class AttendanceInputDialog(tk.Toplevel):
         except Exception as e:
             messagebox.showerror("Error", f"Invalid input: {e}")
 
+class VirtualTable:
+    # Only the visible rows (plus a small buffer) exist as Treeview items. Scrolling
+    # refills that fixed pool of items from self.rows, so Tk never holds the full roster.
+    BUFFER = 5
+    HEADER_HEIGHT = 25
+
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = []
+        self.index = {}
+        self.month = None
+        self.offset = 0
+        self.visible = 20
+        self.pool = []
+        self.row_at = {}
+
+        scrollbar.config(command=self.yview)
+        tree.configure(yscrollcommand="")
+        tree.bind("<Configure>", self.on_resize)
+        tree.bind("<MouseWheel>", self.on_mousewheel)
+        tree.bind("<Button-4>", self.on_mousewheel)
+        tree.bind("<Button-5>", self.on_mousewheel)
+
+    def set_rows(self, rows, month=None):
+        self.rows = list(rows)
+        self.index = {row[0]: pos for pos, row in enumerate(self.rows)}
+        self.month = month
+        self.offset = 0
+        self.refresh()
+
+    def append_rows(self, rows):
+        for row in rows:
+            self.index[row[0]] = len(self.rows)
+            self.rows.append(row)
+        self.refresh()
+
+    def update_row(self, row):
+        # Replaces one staff's row in place; only touches Tk if that row is on screen
+        pos = self.index.get(row[0])
+        if pos is None:
+            return False
+        if self.rows[pos] != row:
+            self.rows[pos] = row
+            if self.offset <= pos < self.offset + len(self.pool):
+                iid = self.pool[pos - self.offset]
+                self.tree.item(iid, values=row)
+                self.row_at[iid] = row
+        return True
+
+    def remove_row(self, name):
+        pos = self.index.pop(name, None)
+        if pos is None:
+            return False
+        del self.rows[pos]
+        for later_name, later_pos in self.index.items():
+            if later_pos > pos:
+                self.index[later_name] = later_pos - 1
+        self.refresh()
+        return True
+
+    def row_for(self, iid):
+        return self.row_at.get(iid)
+
+    def refresh(self):
+        selected_names = {self.row_at[iid][0] for iid in self.tree.selection() if iid in self.row_at}
+        self.offset = max(0, min(self.offset, len(self.rows) - self.visible))
+        window = self.rows[self.offset:self.offset + self.visible + self.BUFFER]
+
+        while len(self.pool) < len(window):
+            self.pool.append(self.tree.insert("", "end", values=()))
+        if len(self.pool) > len(window):
+            self.tree.delete(*self.pool[len(window):])
+            del self.pool[len(window):]
+
+        self.row_at = {}
+        keep_selected = []
+        for iid, values in zip(self.pool, window):
+            self.tree.item(iid, values=values)
+            self.row_at[iid] = values
+            if values[0] in selected_names:
+                keep_selected.append(iid)
+        # Selection follows the staff, not the recycled item
+        if set(keep_selected) != set(self.tree.selection()):
+            self.tree.selection_set(keep_selected)
+        self.tree.yview_moveto(0)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = len(self.rows)
+        if total <= self.visible:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible) / total)
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.offset += step * self.visible if args[2] == "pages" else step
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        # Windows/macOS report delta, X11 reports buttons 4 (up) and 5 (down)
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.yview("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def on_resize(self, event):
+        rowheight = ttk.Style().lookup("Treeview", "rowheight")
+        rowheight = int(rowheight) if rowheight else 20
+        visible = max(1, (event.height - self.HEADER_HEIGHT) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self.refresh()
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, label):
+        self.label = label
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise JobCancelled()
+
+    def progress(self, done, total):
+        # Also the natural place for long loops to notice a cancel request
+        self.check()
+        ui_queue.put(("progress", self, done, total))
+
+    def run_on_ui(self, func, *args):
+        # Blocks this background thread until the Tk thread has run func(*args),
+        # so a producer never gets more than one batch ahead of the UI
+        done = threading.Event()
+        outcome = {}
+        ui_queue.put(("call", self, (func, args, outcome, done), None))
+        while not done.wait(0.1):
+            self.check()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("result")
+
+
+class BackgroundWorker:
+    # Runs heavy jobs on a thread pool. Everything a job reports (progress, result,
+    # error) goes through ui_queue and is handled here on the Tk thread via root.after.
+    POLL_MS = 50
+
+    def __init__(self, root, status_var, progressbar, max_workers=2):
+        self.root = root
+        self.status_var = status_var
+        self.progressbar = progressbar
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="staffapp-worker")
+        self.running = []
+        root.after(self.POLL_MS, self.poll)
+
+    def submit(self, label, func, *args, on_done=None):
+        # func(job, *args) runs in the background; on_done(result) runs on the Tk thread
+        job = Job(label)
+        self.running.append(job)
+        self.status_var.set(f"{label}...")
+        self.executor.submit(self.run, job, func, args, on_done)
+        return job
+
+    def run(self, job, func, args, on_done):
+        try:
+            result = func(job, *args)
+        except JobCancelled:
+            ui_queue.put(("cancelled", job, None, None))
+        except Exception as e:
+            ui_queue.put(("error", job, e, None))
+        else:
+            ui_queue.put(("done", job, result, on_done))
+
+    def finish(self, job):
+        if job in self.running:
+            self.running.remove(job)
+        if not self.running:
+            self.progressbar.config(value=0)
+            self.status_var.set("Ready")
+
+    def poll(self):
+        try:
+            while True:
+                kind, job, value, extra = ui_queue.get_nowait()
+                if kind == "progress":
+                    # A total of 0 means the job cannot tell how much is left, only what is done
+                    if extra:
+                        self.progressbar.config(maximum=extra, value=value)
+                        self.status_var.set(f"{job.label}... {value}/{extra}")
+                    else:
+                        self.status_var.set(f"{job.label}... {value}")
+                    continue
+                if kind == "call":
+                    func, args, outcome, done = value
+                    try:
+                        outcome["result"] = func(*args)
+                    except Exception as e:
+                        outcome["error"] = e
+                    finally:
+                        done.set()
+                    continue
+                self.finish(job)
+                if kind == "done" and extra and not job.cancelled.is_set():
+                    extra(value)
+                elif kind == "error":
+                    messagebox.showerror(f"{job.label} Failed", str(value))
+                elif kind == "cancelled":
+                    self.status_var.set(f"{job.label} cancelled")
+        except queue.Empty:
+            pass
+        self.root.after(self.POLL_MS, self.poll)
+
+    def cancel_all(self):
+        for job in self.running:
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=True)
+        save_executor.shutdown(wait=True)
+
+
+class StaffSearchIndex:
+    # Sorted lowercase names for bisect prefix lookups, plus a trigram index so a
+    # mistyped name still finds candidates. Kept up to date by add()/remove().
+    FUZZY_MIN_SCORE = 0.3
+
+    def __init__(self, names=()):
+        self.version = 0
+        self.entries = sorted((name.lower(), name) for name in names)
+        self.trigrams = defaultdict(set)
+        for name in names:
+            for gram in self.grams(name):
+                self.trigrams[gram].add(name)
+
+    @staticmethod
+    def grams(text):
+        padded = f"  {text.lower()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, name):
+        entry = (name.lower(), name)
+        pos = bisect.bisect_left(self.entries, entry)
+        if pos < len(self.entries) and self.entries[pos] == entry:
+            return
+        self.entries.insert(pos, entry)
+        self.version += 1
+        for gram in self.grams(name):
+            self.trigrams[gram].add(name)
+
+    def remove(self, name):
+        entry = (name.lower(), name)
+        pos = bisect.bisect_left(self.entries, entry)
+        if pos < len(self.entries) and self.entries[pos] == entry:
+            del self.entries[pos]
+        self.version += 1
+        for gram in self.grams(name):
+            names = self.trigrams.get(gram)
+            if names:
+                names.discard(name)
+                if not names:
+                    del self.trigrams[gram]
+
+    def prefix(self, text):
+        text = text.lower()
+        matches = []
+        for key, name in self.entries[bisect.bisect_left(self.entries, (text,)):]:
+            if not key.startswith(text):
+                break
+            matches.append(name)
+        return matches
+
+    def fuzzy(self, text, limit=20):
+        query = self.grams(text)
+        shared = defaultdict(int)
+        for gram in query:
+            for name in self.trigrams.get(gram, ()):
+                shared[name] += 1
+        scored = []
+        for name, count in shared.items():
+            # Dice coefficient over trigram sets
+            score = 2 * count / (len(query) + len(self.grams(name)))
+            if score >= self.FUZZY_MIN_SCORE:
+                scored.append((-score, name))
+        return [name for _, name in sorted(scored)[:limit]]
+
+    def search(self, text):
+        # Prefix matches first; only fall back to typo-tolerant matching when there are none
+        return self.prefix(text) or self.fuzzy(text)
+
 # ================== DEALING WITH DATA ==========================================
 
+@lru_cache(maxsize=4096)
 def is_valid_date(date_str):
     try:
         datetime.strptime(date_str, "%Y-%m-%d")
@@ -161,10 +945,182 @@ def calc_monthly_stats(attendance):
         stats[month]["absent"] += hours.get("absent", 0)
     return stats
 
+
+# Each staff keeps "monthly_stats" {month: totals} next to "attendance", so rendering
+# a month is a lookup. set_attendance_week() keeps it in step one week at a time.
+def add_week_to_cache(staff, week, hours, sign=1):
+    if not isinstance(hours, dict) or not is_valid_date(week):
+        return None
+    month = week[:7]
+    totals = staff.setdefault("monthly_stats", {}).setdefault(month, {
+        "scheduled": 0,
+        "attended": 0,
+        "tardiness": 0,
+        "absent": 0
+    })
+    for key in totals:
+        # Rounded so repeated subtract/add of the same week does not drift
+        totals[key] = round(totals[key] + sign * hours.get(key, 0), 6)
+    return month
+
+
+def set_attendance_week(name, week, hours):
+    # Returns the journal changes for the week and the affected month totals
+    staff = staffList[name]
+    attendance = staff.setdefault("attendance", {})
+    add_week_to_cache(staff, week, attendance.get(week), sign=-1)
+    attendance[week] = {
+        "scheduled": hours["scheduled"],
+        "attended": hours["attended"],
+        "tardiness": hours["tardiness"],
+        "absent": hours["absent"]
+    }
+    changes = [journal_set([name, "attendance", week], attendance[week])]
+    month = add_week_to_cache(staff, week, attendance[week])
+    if month:
+        changes.append(journal_set([name, "monthly_stats", month], staff["monthly_stats"][month]))
+    return changes
+
+
+def merge_staff_weeks(name, weeks, month_totals):
+    # Bulk form of set_attendance_week for one staff: weeks {week: hours} replace
+    # existing ones, month_totals {month: hours} are the precomputed sums of those weeks
+    staff = staffList[name]
+    attendance = staff.setdefault("attendance", {})
+    delta = defaultdict(lambda: dict.fromkeys(HOUR_COLUMNS, 0))
+    for week in weeks.keys() & attendance.keys():
+        old = attendance[week]
+        if isinstance(old, dict) and is_valid_date(week):
+            for key in HOUR_COLUMNS:
+                delta[week[:7]][key] -= old.get(key, 0)
+    for month, hours in month_totals.items():
+        for key in HOUR_COLUMNS:
+            delta[month][key] += hours[key]
+    attendance.update(weeks)
+
+    cache = staff.setdefault("monthly_stats", {})
+    for month, hours in delta.items():
+        totals = cache.setdefault(month, dict.fromkeys(HOUR_COLUMNS, 0))
+        for key in totals:
+            totals[key] = round(totals[key] + hours[key], 6)
+    return [
+        journal_merge([name, "attendance"], weeks),
+        journal_merge([name, "monthly_stats"], {month: cache[month] for month in delta})
+    ]
+
+
+def ensure_monthly_cache():
+    # Builds the cache once for staff saved before it existed
+    changes = []
+    for name, staff in staffList.items():
+        if "monthly_stats" not in staff:
+            # Runs at startup before any background job exists
+            staff["monthly_stats"] = dict(calc_monthly_stats(staff.get("attendance", {})))
+            # Nothing to save for staff without attendance; an empty cache is rebuilt for free
+            if staff["monthly_stats"]:
+                changes.append(journal_set([name, "monthly_stats"], staff["monthly_stats"]))
+    if changes:
+        save_staff(changes)
+
+# ================== VECTORIZED VIEWS ==========================================
+
+HOUR_COLUMNS = ["scheduled", "attended", "tardiness", "absent"]
+frame_cache = {"version": None}
+
+
+def build_attendance_frame():
+    # One row per (staff, week), with the month the week belongs to
+    records = [
+        (name, week, hours.get("scheduled", 0), hours.get("attended", 0), hours.get("tardiness", 0), hours.get("absent", 0))
+        for name, staff in staffList.items()
+        for week, hours in staff.get("attendance", {}).items()
+        if isinstance(hours, dict)
+    ]
+    return attendance_frame(records)
+
+
+def attendance_frame(records):
+    frame = pd.DataFrame.from_records(records, columns=["name", "week_start"] + HOUR_COLUMNS)
+    # Same rule as calc_monthly_stats: weeks that are not real dates are ignored
+    frame["month"] = frame["week_start"].str[:7]
+    frame["week_start"] = pd.to_datetime(frame["week_start"], format="%Y-%m-%d", errors="coerce")
+    frame = frame.dropna(subset=["week_start"])
+    frame[HOUR_COLUMNS] = frame[HOUR_COLUMNS].astype(float)
+    return frame
+
+
+def build_staff_frame():
+    return pd.DataFrame.from_records(
+        [
+            (name, staff.get("bonus", {}).get("current_bonus", 0), staff.get("bonus", {}).get("current_chance", 0),
+             staff.get("lastUpdate", "N/A"))
+            for name, staff in staffList.items()
+        ],
+        columns=["name", "bonus", "chance", "lastUpdate"]
+    ).set_index("name").sort_index()
+
+
+def get_frames():
+    # Flattened once per data_version, then every month switch reuses the grouped totals
+    if frame_cache["version"] != data_version:
+        attendance = build_attendance_frame()
+        frame_cache.update({
+            "version": data_version,
+            "attendance": attendance,
+            "month_totals": attendance.groupby(["month", "name"])[HOUR_COLUMNS].sum().sort_index(),
+            "staff": build_staff_frame()
+        })
+    return frame_cache
+
+
+def month_view_rows(month):
+    # Table rows for every staff in one month, computed column-wise
+    frames = get_frames()
+    month_totals = frames["month_totals"]
+    if month in month_totals.index.get_level_values("month"):
+        totals = month_totals.xs(month, level="month")
+    else:
+        totals = month_totals.iloc[0:0].droplevel("month")
+    view = frames["staff"].join(totals, how="left").fillna({col: 0 for col in HOUR_COLUMNS})
+    scheduled = view["scheduled"]
+    pct = (view["attended"] / scheduled.where(scheduled > 0) * 100).round(2)
+    pct_text = [f"{p}%" if has_hours else "0%" for p, has_hours in zip(pct.tolist(), (scheduled > 0).tolist())]
+    return list(zip(
+        view.index.tolist(), view["bonus"].tolist(), view["chance"].tolist(),
+        *(view[col].tolist() for col in HOUR_COLUMNS), pct_text, view["lastUpdate"].tolist()
+    ))
+
+
+def perfect_attendance_rule(scheduled, tardiness, absent):
+    # Works on single totals and on whole columns alike
+    return (scheduled > 0) & (tardiness <= PERFECT_MAX_TARDINESS) & (absent <= PERFECT_MAX_ABSENT)
+
+
+def detect_perfect_attendance(month):
+    # Perfect/imperfect for every staff with scheduled hours in the month, as a bool Series by name
+    month_totals = get_frames()["month_totals"]
+    if month not in month_totals.index.get_level_values("month"):
+        return pd.Series(dtype=bool)
+    totals = month_totals.xs(month, level="month")
+    totals = totals[totals["scheduled"] > 0]
+    return perfect_attendance_rule(totals["scheduled"], totals["tardiness"], totals["absent"])
+
+
 # ================== HELPER FUNCTIONS ==========================================
 def clear_table():
-    for item in tree.get_children():
-        tree.delete(item)
+    cancel_table_job()
+    table.set_rows([])
+
+
+def render_rows(rows, month):
+    # Replace the whole table in one pass from prebuilt row tuples
+    cancel_table_job()
+    table.set_rows(rows, month)
+
+
+def refresh_staff_row(name, month):
+    # Patches just this staff's cells when the table already shows them for that month
+    return table.month == month and table.update_row(staff_row(name, month))
 
 def update_btn(state):
     recordBtn.config(state=state)
@@ -174,7 +1130,7 @@ def update_btn(state):
 
 # ================== MAIN FEATURES ==========================================
 
-staffList = load_staff()
+# staffList and search_index are created at startup, see the bottom of the file
 current_name = None
 
 def find_staff():
@@ -183,8 +1139,11 @@ def find_staff():
     if not name_input:
         messagebox.showerror("Error", "Please enter a name.")
         return
+    # Enter wins over a live search still waiting for its debounce
+    cancel_live_search()
+    live_search_state.update(query=name_input, prefix_matches=None)
 
-    matches = [name for name in staffList if name.lower().startswith(name_input)]
+    matches = search_index.search(name_input)
 
     if not matches:
         messagebox.showerror("Not Found", "No matching staff found.")
@@ -195,12 +1154,57 @@ def find_staff():
         show_staff(current_name)
         update_btn("normal")
     else:
-        clear_table()
-        for name in sorted(matches):
-            show_staff(name, single=False)
+        this_month = month_var.get() or datetime.now().strftime("%Y-%m")
+        render_rows([staff_row(name, this_month) for name in matches], this_month)
         update_btn("disabled")
 
 
+# Live filtering while typing: each keystroke restarts a short timer, so only the
+# last query in a burst runs, and a longer query only filters the previous matches.
+SEARCH_DEBOUNCE_MS = 200
+live_search_state = {"after_id": None, "query": None, "prefix_matches": None, "version": None}
+
+
+def cancel_live_search():
+    if live_search_state["after_id"] is not None:
+        root.after_cancel(live_search_state["after_id"])
+        live_search_state["after_id"] = None
+
+
+def schedule_live_search(event=None):
+    if event is not None and event.keysym in ("Return", "KP_Enter"):
+        return
+    cancel_live_search()
+    live_search_state["after_id"] = root.after(SEARCH_DEBOUNCE_MS, live_search)
+
+
+def live_search():
+    global current_name
+    live_search_state["after_id"] = None
+    query = entry.get().strip().lower()
+    previous = live_search_state["query"]
+    if query == previous:
+        return
+    if not query:
+        live_search_state.update(query="", prefix_matches=None)
+        list_all_staff()
+        return
+
+    prior = live_search_state["prefix_matches"]
+    if prior is not None and previous and query.startswith(previous) \
+            and live_search_state["version"] == search_index.version:
+        prefix_matches = [name for name in prior if name.lower().startswith(query)]
+    else:
+        prefix_matches = search_index.prefix(query)
+    live_search_state.update(query=query, prefix_matches=prefix_matches, version=search_index.version)
+    matches = prefix_matches or search_index.fuzzy(query)
+
+    current_name = ""
+    this_month = month_var.get() or datetime.now().strftime("%Y-%m")
+    render_rows([staff_row(name, this_month) for name in matches], this_month)
+    update_btn("disabled")
+
+
 def record_attendance():
     if not current_name:
         return
@@ -218,46 +1222,29 @@ def record_attendance():
     if not staff:
         return
 
-    # Check if the attendance data for the week already exists
-    existing_week_data = staff.get("attendance", {}).get(week_key)
-
     dialog = AttendanceInputDialog(root, week_key)
     root.wait_window(dialog)
     if not dialog.result:
         return
     hours = dialog.result
 
-    # Initialize 'attendance' dictionary if it doesn't exist
-    if "attendance" not in staff:
-        staff["attendance"] = {}
-
-    # If the week's data exists, update it. Otherwise, create a new entry.
-    if existing_week_data:
-        existing_week_data.update({
-            "scheduled": hours["scheduled"],
-            "attended": hours["attended"],
-            "tardiness": hours["tardiness"],
-            "absent": hours["absent"]
-        })
-    else:
-        # If no existing week data, create a new entry
-        staff["attendance"][week_key] = {
-            "scheduled": hours["scheduled"],
-            "attended": hours["attended"],
-            "tardiness": hours["tardiness"],
-            "absent": hours["absent"]
-        }
+    with staff_lock:
+        # Store the week (new or overwritten) and keep the monthly totals in step
+        changes = set_attendance_week(current_name, week_key, hours)
 
-    # Update last update timestamp
-    staff["lastUpdate"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        # Update last update timestamp
+        staff["lastUpdate"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        changes.append(mark_changed(current_name))
 
     # Save the updated staff data
-    save_staff()
+    changes.append(journal_set([current_name, "lastUpdate"], staff["lastUpdate"]))
+    save_staff(changes)
 
     # Display updated staff info
     # Iinstead of
     # show_staff(current_name)
-    show_updated_staff(current_name, selected_date) 
+    if not refresh_staff_row(current_name, selected_date[:7]):
+        show_updated_staff(current_name, selected_date) 
     # showing data from the month we just recorded, instead of selected on right top 
 
     messagebox.showinfo("Recorded", f"Attendance for the week starting {week_key} saved.")
@@ -265,30 +1252,14 @@ def record_attendance():
 
 def list_all_staff():
     global current_name  # Add this line to access the global variable
-    clear_table()
-    print("listtting")
-    if current_name:
-        current_name = ""
-    for name in sorted(staffList):
-        # show_staff(name, single=False)
-        update_table()
+    current_name = ""
+    update_table()
     update_btn("disabled")
 
 
-def show_staff(name, single=True):
-    if single:
-        clear_table()
-
+def staff_row(name, month):
     staff = staffList[name]
-    stats = calc_monthly_stats(staff.get("attendance", {}))
-    
-    selected_month = month_var.get()
-    if selected_month: 
-        this_month = selected_month
-    else: 
-        this_month = datetime.now().strftime("%Y-%m")
-    # this_month = datetime.now().strftime("%Y-%m")
-    month_stat = stats.get(this_month, {})
+    month_stat = get_month_stat(name, month)
     bonus_info = staff.get("bonus", {})
     
     bonus = bonus_info["current_bonus"]
@@ -299,7 +1270,7 @@ def show_staff(name, single=True):
     absent = month_stat.get("absent", 0)
     attendance_pct = round((attended / scheduled * 100) if scheduled else 0, 2)
 
-    tree.insert("", "end", values=(
+    return (
         name,
         bonus, 
         chance, 
@@ -309,147 +1280,1172 @@ def show_staff(name, single=True):
         absent,
         f"{attendance_pct}%",
         staff.get("lastUpdate", "N/A")
-    ))
+    )
+
+
+def show_staff(name, single=True):
+    selected_month = month_var.get()
+    if selected_month: 
+        this_month = selected_month
+    else: 
+        this_month = datetime.now().strftime("%Y-%m")
+    # this_month = datetime.now().strftime("%Y-%m")
+    if single:
+        render_rows([staff_row(name, this_month)], this_month)
+        suggest_perfect(name, bonus_month())
+    else:
+        table.append_rows([staff_row(name, this_month)])
     global current_name
     current_name = name
 
 
 def show_updated_staff(name, selected_date ,single=True):
-    if single:
-        clear_table()
-    staff = staffList[name]
-    stats = calc_monthly_stats(staff.get("attendance", {}))
     # date_picker = DatePicker(root)
     # selected_date = date_picker.result
     # print(f"selected date: {selected_date}")
     # print(f"selected month: {selected_date[:7]}")
     this_month = selected_date[:7]
-    month_stat = stats.get(this_month, {})
-    bonus_info = staff.get("bonus", {})
-    
-    bonus = bonus_info["current_bonus"]
-    chance = bonus_info["current_chance"]
-    scheduled = month_stat.get("scheduled", 0)
-    attended = month_stat.get("attended", 0)
-    tardiness = month_stat.get("tardiness", 0)
-    absent = month_stat.get("absent", 0)
-    attendance_pct = round((attended / scheduled * 100) if scheduled else 0, 2)
-
-    tree.insert("", "end", values=(
-        name,
-        bonus, 
-        chance, 
-        scheduled,
-        attended,
-        tardiness,
-        absent,
-        f"{attendance_pct}%",
-        staff.get("lastUpdate", "N/A")
-    ))
+    if single:
+        render_rows([staff_row(name, this_month)], this_month)
+    else:
+        table.append_rows([staff_row(name, this_month)])
     global current_name
     current_name = name
 
 
-def export_to_excel():
-    filename = f"staff_attendance_{datetime.now().strftime('%Y%m%d')}.csv"
-    with open(filename, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Name", "Current Bonus", "Current Chance", "Scheduled Hours", "Attended Hours", "Tardiness Hours", "Absent Hours", "Attendance %", "Last Updated", "Monthly Stats"])
-        
-        for name in sorted(staffList):
-            staff = staffList[name]
-            stats = calc_monthly_stats(staff.get("attendance", {}))
-            month_stat = stats.get(datetime.now().strftime("%Y-%m"), {})
+# A ".gz" or ".zst" suffix on a CSV name compresses on write and decompresses on read as
+# the data flows through, so neither side ever holds the whole file uncompressed
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+def split_compression(filename):
+    base, ext = os.path.splitext(filename)
+    if ext.lower() in COMPRESSED_SUFFIXES:
+        return base, ext.lower()
+    return filename, ""
+
+
+def is_csv_path(filename):
+    return split_compression(filename)[0].lower().endswith(".csv")
+
+
+def require_zstandard():
+    if zstandard is None:
+        raise RuntimeError("Reading or writing .zst files needs the zstandard package (pip install zstandard).")
+
+
+@contextmanager
+def export_tmp_path(filename):
+    # Exports are written to a hidden file next to the target and renamed over it only once
+    # complete, so a cancelled or failed export never leaves a partial file under that name.
+    # The prefix keeps the suffix, which decides the format and compression.
+    tmp_path = os.path.join(os.path.dirname(filename), ".tmp_" + os.path.basename(filename))
+    try:
+        yield tmp_path
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_export_text(filename):
+    compression = split_compression(filename)[1]
+    if compression == ".gz":
+        return gzip.open(filename, "wt", newline="", compresslevel=6)
+    if compression == ".zst":
+        require_zstandard()
+        stream = zstandard.ZstdCompressor(level=3).stream_writer(open(filename, "wb"))
+        return io.TextIOWrapper(stream, newline="")
+    return open(filename, mode="w", newline="")
+
+
+def open_import_binary(filepath):
+    # Returns (reader, raw): data is read from reader, raw.tell() is how far into the
+    # file on disk that has got
+    raw = open(filepath, "rb")
+    compression = split_compression(filepath)[1]
+    if compression == ".gz":
+        return gzip.GzipFile(fileobj=raw), raw
+    if compression == ".zst":
+        require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=False), raw
+    return raw, raw
+
+
+# Exports are long format: one row per staff per month. Rows are produced month by month
+# and handed straight to the file writer, so only one month is ever held in memory.
+EXPORT_COLUMNS = ["Name", "Month", "Scheduled Hours", "Attended Hours", "Tardiness Hours", "Absent Hours",
+                  "Attendance %", "Bonus", "Chance"]
+SUMMARY_COLUMNS = ["Name", "Months", "Scheduled Hours", "Attended Hours", "Tardiness Hours", "Absent Hours",
+                   "Attendance %", "Latest Bonus", "Latest Chance"]
+MONTH_RANGE_PATTERN = re.compile(r"^\s*(\d{4}-\d{2})\s*(?:(?:to|-)\s*(\d{4}-\d{2}))?\s*$")
+
+
+def month_range(start, end):
+    year, month = map(int, start.split("-"))
+    last = tuple(map(int, end.split("-")))
+    while (year, month) <= last:
+        yield f"{year}-{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def parse_month_range(text):
+    # "2025-04" or "2025-01 to 2025-06"; returns the list of months or None
+    match = MONTH_RANGE_PATTERN.match(text or "")
+    if not match:
+        return None
+    start, end = match.group(1), match.group(2) or match.group(1)
+    if not all(1 <= int(month[5:]) <= 12 for month in (start, end)) or end < start:
+        return None
+    return list(month_range(start, end))
+
+
+def month_export_rows(month, names=None):
+    # Built under the lock so each month is a consistent snapshot; the bonus columns
+    # are what that month's bonus run recorded, blank if it was never run
+    rows = []
+    with staff_lock:
+        for name in sorted(staffList) if names is None else names:
+            staff = staffList.get(name)
+            if staff is None:
+                continue
+            month_stat = staff.get("monthly_stats", {}).get(month, {})
             scheduled = month_stat.get("scheduled", 0)
             attended = month_stat.get("attended", 0)
-            tardiness = month_stat.get("tardiness", 0)
-            absent = month_stat.get("absent", 0)
             attendance_pct = round((attended / scheduled * 100) if scheduled else 0, 2)
-            
-            bonus_info = staff.get("bonus", {})
-            current_bonus = bonus_info.get("current_bonus", 20)
-            current_chance = bonus_info.get("current_chance", 0)
+            history = staff.get("bonus", {}).get("bonus_history", {}).get(month, {})
+            rows.append([name, month, scheduled, attended, month_stat.get("tardiness", 0),
+                         month_stat.get("absent", 0), attendance_pct,
+                         history.get("bonus", ""), history.get("chance", "")])
+    return rows
 
-            writer.writerow([name, current_bonus, current_chance, scheduled, attended, tardiness, absent, f"{attendance_pct}%", staff.get("lastUpdate", "N/A"), month_stat])
 
-    messagebox.showinfo("Exported", f"Data saved to {filename}")
+def iter_export_rows(job, months):
+    for done, month in enumerate(months, 1):
+        for row in month_export_rows(month):
+            row[6] = f"{row[6]}%"
+            yield row
+        job.progress(done, len(months))
 
 
-def import_excel():
-    filepath = filedialog.askopenfilename(
-        title="Select File",
-        filetypes=[("CSV or Excel files", "*.csv *.xlsx *.xls")]
+def write_csv_export(job, filename, months):
+    with export_tmp_path(filename) as tmp_path, open_export_text(tmp_path) as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(iter_export_rows(job, months))
+    return filename
+
+
+def write_xlsx_export(job, filename, months):
+    # A write-only workbook streams every appended row to a temp file per sheet, so
+    # memory stays flat however many staff and months go in. The summary sheet comes
+    # first in the workbook but is filled last, from running per-staff totals.
+    workbook = Workbook(write_only=True)
+    summary = workbook.create_sheet("Summary")
+    totals = {}
+    for done, month in enumerate(months, 1):
+        sheet = workbook.create_sheet(month)
+        sheet.append(EXPORT_COLUMNS)
+        for row in month_export_rows(month):
+            sheet.append(row)
+            total = totals.setdefault(row[0], [0, 0, 0, 0, 0, "", ""])
+            if row[2]:
+                total[0] += 1
+            for i in range(4):
+                total[i + 1] += row[i + 2]
+            if row[7] != "":
+                total[5], total[6] = row[7], row[8]
+        job.progress(done, len(months))
+
+    summary.append(SUMMARY_COLUMNS)
+    for name in sorted(totals):
+        months_worked, scheduled, attended, tardiness, absent, bonus, chance = totals[name]
+        attendance_pct = round((attended / scheduled * 100) if scheduled else 0, 2)
+        summary.append([name, months_worked, scheduled, attended, tardiness, absent, attendance_pct, bonus, chance])
+    with export_tmp_path(filename) as tmp_path:
+        workbook.save(tmp_path)
+    return filename
+
+
+def sqlite_week_records(months):
+    # Runs on the save thread, so every save queued before it is already in. Only the weeks
+    # in the months are read, through idx_attendance_week
+    return get_db().execute(
+        "SELECT name, week_start, scheduled, attended, tardiness, absent FROM attendance "
+        "WHERE week_start BETWEEN ? AND ?",
+        (months[0] + "-01", months[-1] + "-31")
+    ).fetchall()
+
+
+def weekly_export_frame(months):
+    # Weekly records for the months, typed for analytics: dates, float32 hours and the
+    # month's recorded bonus/chance as nullable ints (no bonus run -> null). The SQLite
+    # backend reads just those weeks from the database instead of flattening every staff.
+    if STORAGE_BACKEND == "sqlite":
+        attendance = attendance_frame(save_executor.submit(sqlite_week_records, months).result())
+    with staff_lock:
+        if STORAGE_BACKEND != "sqlite":
+            attendance = get_frames()["attendance"]
+        bonus = pd.DataFrame.from_records(
+            [
+                (name, month, record.get("bonus"), record.get("chance"))
+                for name, staff in staffList.items()
+                for month, record in staff.get("bonus", {}).get("bonus_history", {}).items()
+                if month in months
+            ],
+            columns=["name", "month", "bonus", "chance"]
+        )
+    frame = attendance[attendance["month"].isin(months)].merge(bonus, on=["name", "month"], how="left")
+    return pd.DataFrame({
+        "name": frame["name"].astype("string"),
+        "week_start": frame["week_start"].dt.date,
+        **{col: frame[col].astype("float32") for col in HOUR_COLUMNS},
+        "bonus": frame["bonus"].astype("Int32"),
+        "chance": frame["chance"].astype("Int32"),
+        "year": frame["week_start"].dt.year.astype("int16"),
+        "month": frame["week_start"].dt.month.astype("int8"),
+    })
+
+
+def write_parquet_export(job, filename, months):
+    # filename is a dataset directory laid out as year=YYYY/month=M/*.parquet, so readers
+    # can prune to the partitions they query. Re-exporting a month replaces its partition
+    # and leaves the others alone. Needs pyarrow.
+    frame = weekly_export_frame(months)
+    if frame.empty:
+        # to_parquet would write nothing at all, not even the dataset directory
+        span = months[0] if len(months) == 1 else f"{months[0]} to {months[-1]}"
+        raise ValueError(f"No weekly records in {span}, nothing was exported.")
+    job.progress(1, 2)
+    frame.to_parquet(filename, engine="pyarrow", partition_cols=["year", "month"], index=False,
+                     existing_data_behavior="delete_matching")
+    return filename
+
+
+EXPORT_WRITERS = {".xlsx": write_xlsx_export, ".csv": write_csv_export, ".parquet": write_parquet_export}
+
+
+# Delta export: only staff whose changeSeq is above the high-water mark left by the
+# previous delta export, plus staff deleted since then. The mark only moves once the
+# file is written, so a failed export is simply repeated next time.
+DELTA_COLUMNS = EXPORT_COLUMNS + ["Change"]
+
+
+def get_export_state_path():
+    return os.path.splitext(get_data_path())[0] + "_export_state.json"
+
+
+def load_export_state():
+    try:
+        with open(get_export_state_path(), "r") as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        state = {}
+    state.setdefault("high_water", -1)  # -1: no delta export yet, so everyone is included
+    state.setdefault("deleted", {})
+    return state
+
+
+def save_export_state(state):
+    tmp_path = get_export_state_path() + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=4)
+    os.replace(tmp_path, get_export_state_path())
+
+
+def record_deleted_staff(name, seq):
+    # Runs on the save thread
+    state = load_export_state()
+    state["deleted"][name] = seq
+    save_export_state(state)
+
+
+def commit_export_state(high_water):
+    # Runs on the save thread once the delta file is written
+    state = load_export_state()
+    state["high_water"] = high_water
+    state["deleted"] = {name: seq for name, seq in state["deleted"].items() if seq > high_water}
+    save_export_state(state)
+
+
+def write_delta_export(job, filename, months):
+    with staff_lock:
+        high_water = change_seq
+        # Queued behind any deletion already recorded, so none is missed
+        state_future = save_executor.submit(load_export_state)
+    state = state_future.result()
+    last_mark = state["high_water"]
+    with staff_lock:
+        changed = sorted(name for name, staff in staffList.items() if staff.get("changeSeq", 0) > last_mark)
+    deleted = sorted(name for name, seq in state["deleted"].items()
+                     if last_mark < seq <= high_water and name not in staffList)
+
+    with export_tmp_path(filename) as tmp_path, open_export_text(tmp_path) as file:
+        writer = csv.writer(file)
+        writer.writerow(DELTA_COLUMNS)
+        for done, month in enumerate(months, 1):
+            for row in month_export_rows(month, changed):
+                row[6] = f"{row[6]}%"
+                writer.writerow(row + ["updated"])
+            job.progress(done, len(months))
+        for name in deleted:
+            writer.writerow([name] + [""] * (len(EXPORT_COLUMNS) - 1) + ["deleted"])
+    save_executor.submit(commit_export_state, high_water).add_done_callback(report_save_error)
+    return filename, len(changed), len(deleted)
+
+
+def ask_export_months(title):
+    # Defaults to the month picked in the month selector
+    text = simpledialog.askstring(title, "Month or range to export (YYYY-MM, or YYYY-MM to YYYY-MM):",
+                                  initialvalue=month_var.get() or datetime.now().strftime("%Y-%m"))
+    if text is None:
+        return None
+    months = parse_month_range(text)
+    if not months:
+        messagebox.showerror("Export Failed", f"'{text}' is not a month or a month range.")
+    return months
+
+
+def export_changes():
+    months = ask_export_months("Export Changes")
+    if not months:
+        return
+    filename = filedialog.asksaveasfilename(
+        title="Export Changes",
+        initialfile=f"staff_changes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        defaultextension=".csv",
+        filetypes=[("CSV file", "*.csv"), ("Compressed CSV", "*.csv.gz *.csv.zst")]
     )
-    if not filepath:
+    if not filename:
         return
+    if not is_csv_path(filename):
+        messagebox.showerror("Export Failed", "Choose a .csv, .csv.gz or .csv.zst file name.")
+        return
+    worker.submit("Export", write_delta_export, filename, months,
+                  on_done=lambda result: messagebox.showinfo(
+                      "Exported", f"{result[1]} changed and {result[2]} deleted staff saved to {result[0]}"))
+
 
+def export_to_excel():
+    months = ask_export_months("Export")
+    if not months:
+        return
+    span = months[0] if len(months) == 1 else f"{months[0]}_to_{months[-1]}"
+    filename = filedialog.asksaveasfilename(
+        title="Export",
+        initialfile=f"staff_attendance_{span}.xlsx",
+        defaultextension=".xlsx",
+        filetypes=[("Excel workbook", "*.xlsx"), ("CSV file", "*.csv"), ("Compressed CSV", "*.csv.gz *.csv.zst"),
+                   ("Parquet dataset (weekly)", "*.parquet")]
+    )
+    if not filename:
+        return
+    # Workbooks and Parquet are compressed already; only CSV takes .gz/.zst
+    base, compression = split_compression(filename)
+    writer = EXPORT_WRITERS.get(os.path.splitext(base)[1].lower())
+    if writer is None or (compression and writer is not write_csv_export):
+        messagebox.showerror("Export Failed", "Choose a .xlsx, .csv, .csv.gz, .csv.zst or .parquet file name.")
+        return
+    worker.submit("Export", writer, filename, months,
+                  on_done=lambda path: messagebox.showinfo("Exported", f"Data saved to {path}"))
+
+
+IMPORT_HOUR_COLUMNS = {
+    "Scheduled Hours": "scheduled",
+    "Attended Hours": "attended",
+    "Tardiness Hours": "tardiness",
+    "Absent Hours": "absent"
+}
+
+
+def coerce_import_frame(df, known_names=None):
+    # Column-wise coercion and validation of a whole chunk. Returns the coerced rows that
+    # pass every check and the original rows that fail, each with the reasons why.
+    # known_names=None accepts any staff name.
+    frame = pd.DataFrame(index=df.index)
+    failures = {}
+    names = df["Name"] if "Name" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    has_name = names.notna() & (names.astype(str).str.strip() != "")
+    failures["missing name"] = ~has_name
+    frame["name"] = names.astype(str)
+    if known_names is not None:
+        failures["unknown staff"] = has_name & ~frame["name"].isin(known_names)
+
+    if "Week Start" in df.columns:
+        frame["week"] = df["Week Start"].astype(str).str[:10]
+    else:
+        frame["week"] = get_week_key(datetime.now().strftime("%Y-%m-%d"))
+    weeks = pd.to_datetime(frame["week"], format="%Y-%m-%d", errors="coerce")
+    failures["invalid week start date"] = weeks.isna()
+    failures["week start is not a Monday"] = weeks.notna() & (weeks.dt.dayofweek != 0)
+
+    numeric = [(column, key, 0, float) for column, key in IMPORT_HOUR_COLUMNS.items()]
+    # Bonus/chance only when the file has them, so importing weeks alone leaves each
+    # staff's bonus as it is
+    if "Current Bonus" in df.columns or "Current Chance" in df.columns:
+        numeric += [("Current Bonus", "bonus", 20, int), ("Current Chance", "chance", 0, int)]
+    for column, key, default, kind in numeric:
+        if column not in df.columns:
+            frame[key] = kind(default)
+            continue
+        # Blank cells take their default, anything else that is not a number is rejected
+        values = pd.to_numeric(df[column], errors="coerce")
+        failures[f"{column} is not a number"] = values.isna() & df[column].notna()
+        frame[key] = values.fillna(default).astype(kind)
+
+    # Same rule as AttendanceInputDialog, with a tolerance for float rounding; rows with
+    # an unreadable hour column are already rejected for that
+    hours_read = pd.Series(True, index=df.index)
+    for column in IMPORT_HOUR_COLUMNS:
+        hours_read &= ~failures.get(f"{column} is not a number", False)
+    hour_sum = frame["attended"] + frame["tardiness"] + frame["absent"]
+    failures["attended + tardiness + absent != scheduled"] = (
+        hours_read & ~np.isclose(hour_sum, frame["scheduled"], atol=1e-6))
+
+    failed = pd.DataFrame(failures)
+    rejected = failed.any(axis=1)
+    return frame[~rejected], reject_rows(df, failed, rejected)
+
+
+def reject_rows(df, failed, rejected):
+    # The original rows that failed, each with its source row and the reasons why
+    rejected_rows = df[rejected].copy()
+    if len(rejected_rows):
+        failed = failed[rejected]
+        rejected_rows["Source Row"] = rejected_rows.index + 2  # 1-based, after the header row
+        rejected_rows["Rejected Reason"] = [", ".join(failed.columns[row]) for row in failed.to_numpy()]
+    return rejected_rows
+
+
+def get_rejected_path(filepath):
+    # Written next to the import; the name does not match staff_attendance_* on purpose
+    folder, filename = os.path.split(split_compression(filepath)[0])
+    return os.path.join(folder, "rejected_" + os.path.splitext(filename)[0] + ".csv")
+
+
+def clear_rejected_rows(path):
+    # A fresh import starts a fresh report; a resumed one keeps adding to it
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def write_rejected_rows(rejected_rows, path):
+    if len(rejected_rows):
+        rejected_rows.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+
+def import_known_names():
+    if IMPORT_ALLOW_NEW_STAFF:
+        return None
+    with staff_lock:
+        return set(staffList)
+
+
+def last_import_bonus(frame):
+    # The last bonus/chance per staff in the rows as read, taken before rows already imported
+    # are dropped; None for frames without bonus/chance columns (the staff's bonus is left alone)
+    if "bonus" not in frame.columns:
+        return None
+    return frame.groupby("name", sort=False)[["bonus", "chance"]].last()
+
+
+def group_import_frame(frame, bonus=None):
+    # Per staff: the weeks to merge, their month totals and the bonus/chance from last_import_bonus
+    staff_updates = {name: {"weeks": {}, "months": {}} for name in frame["name"].unique().tolist()}
+    if bonus is not None:
+        for name, row in zip(bonus.index, bonus.itertuples(index=False)):
+            staff_updates.setdefault(name, {"weeks": {}, "months": {}}).update(
+                bonus=int(row.bonus), chance=int(row.chance))
+    frame = frame.drop_duplicates(["name", "week"], keep="last")
+    is_date = pd.to_datetime(frame["week"], format="%Y-%m-%d", errors="coerce").notna()
+    month_totals = (frame[is_date].assign(month=frame["week"].str[:7])
+                    .groupby(["name", "month"], sort=False)[HOUR_COLUMNS].sum())
+
+    # Plain lists iterate far faster than the frame's own row accessors
+    hours = zip(*(frame[col].tolist() for col in HOUR_COLUMNS))
+    for name, week, values in zip(frame["name"].tolist(), frame["week"].tolist(), hours):
+        staff_updates[name]["weeks"][week] = dict(zip(HOUR_COLUMNS, values))
+    hours = zip(*(month_totals[col].tolist() for col in HOUR_COLUMNS))
+    for (name, month), values in zip(month_totals.index.tolist(), hours):
+        staff_updates[name]["months"][month] = dict(zip(HOUR_COLUMNS, values))
+    return staff_updates
+
+
+# Import index, kept in staff_import_index.db: a SHA-256 per imported file and a 64-bit
+# digest per imported row (name, week and hours; a file's bonus/chance is its last row per
+# staff, taken before any rows are dropped, and only applied where it differs).
+# Rows are only ever appended, and are dropped again when their staff member is deleted.
+# A row is skipped only if it was imported before and staffList still holds exactly those
+# values, so re-importing restores weeks edited or deleted since; a whole file is skipped
+# only if nothing at all has changed since it was imported (same change_seq).
+IMPORT_DIGEST_COLUMNS = ["name", "week"] + HOUR_COLUMNS
+IMPORT_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS import_files (
+    sha256 TEXT PRIMARY KEY,
+    filename TEXT,
+    change_seq INTEGER
+);
+CREATE TABLE IF NOT EXISTS import_rows (
+    digest INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_import_rows_name ON import_rows (name);
+"""
+import_index = None
+import_index_lock = threading.Lock()
+import_index_conn = None
+
+
+def get_import_index_path():
+    return os.path.splitext(get_data_path())[0] + "_import_index.db"
+
+
+def get_import_index_db():
+    # Only used from the save thread
+    global import_index_conn
+    if import_index_conn is None:
+        import_index_conn = sqlite3.connect(get_import_index_path(), check_same_thread=False)
+        import_index_conn.executescript(IMPORT_INDEX_SCHEMA)
+        migrate_import_index_json(import_index_conn)
+    return import_index_conn
+
+
+def migrate_import_index_json(conn):
+    # The index used to be one JSON file. Its files never match a change_seq again, and its
+    # rows carry no staff name, so deleting a staff member does not remove them
+    json_path = os.path.splitext(get_import_index_path())[0] + ".json"
+    if not os.path.exists(json_path):
+        return
     try:
-        if filepath.endswith(".csv"):
-            df = pd.read_csv(filepath)
-        else:
-            df = pd.read_excel(filepath, engine="openpyxl")
-
-        imported_count = 0
-
-        for _, row in df.iterrows():
-            name = row.get("Name")
-            date = str(row.get("Week Start"))[:10] if "Week Start" in row else datetime.now().strftime("%Y-%m-%d")
-            scheduled = row.get("Scheduled Hours", 0)
-            attended = row.get("Attended Hours", 0)
-            tardiness = row.get("Tardiness Hours", 0)
-            absent = row.get("Absent Hours", 0)
-            bonus = row.get("Current Bonus", 20)
-            chance = row.get("Current Chance", 0)
-            print(f"bonus: {bonus}")
-            print(f"chance: {chance}")
-
-            try:
-                scheduled = float(scheduled or 0)
-                attended = float(attended or 0)
-                tardiness = float(tardiness or 0)
-                absent = float(absent or 0)
-                bonus = int(bonus or 20)
-                chance = int(chance or 0)
-            except Exception:
-                continue
+        with open(json_path, "r") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        data = {}
+    digests = np.array(data.get("rows", []), dtype=np.uint64)
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO import_files VALUES (?, ?, -1)", data.get("files", {}).items())
+        conn.executemany("INSERT OR IGNORE INTO import_rows VALUES (?, '')", ((d,) for d in digests.view(np.int64).tolist()))
+    os.remove(json_path)
+
+
+def read_import_index():
+    # Runs on the save thread, so every append or delete queued before it is already in
+    conn = get_import_index_db()
+    files = dict(conn.execute("SELECT sha256, change_seq FROM import_files"))
+    rows = np.fromiter((digest for (digest,) in conn.execute("SELECT digest FROM import_rows")), dtype=np.int64)
+    return {"files": files, "rows": np.unique(rows.view(np.uint64))}
+
+
+def append_import_index(files, seq, names, digests):
+    # Runs on the save thread; digests are stored as signed 64-bit, SQLite's integer
+    conn = get_import_index_db()
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO import_files VALUES (?, ?, ?)",
+                         [(file_hash, filename, seq) for file_hash, filename in files.items()])
+        conn.executemany("INSERT OR IGNORE INTO import_rows VALUES (?, ?)",
+                         zip(digests.view(np.int64).tolist(), names.tolist()))
+
+
+def delete_import_rows(name):
+    # Runs on the save thread
+    conn = get_import_index_db()
+    with conn:
+        conn.execute("DELETE FROM import_rows WHERE name = ?", (name,))
+
+
+def row_digests(frame):
+    # The same digest for an import row and a stored week holding equal hours
+    types = {"name": str, "week": str, **dict.fromkeys(HOUR_COLUMNS, "float64")}
+    return pd.util.hash_pandas_object(frame[IMPORT_DIGEST_COLUMNS].astype(types), index=False).to_numpy()
+
+
+def current_row_digests():
+    # Every stored week as an import row
+    with staff_lock:
+        attendance = get_frames()["attendance"]
+    return row_digests(pd.DataFrame({
+        "name": attendance["name"],
+        "week": attendance["week_start"].dt.strftime("%Y-%m-%d"),
+        **{col: attendance[col] for col in HOUR_COLUMNS}
+    }))
+
+
+def load_import_index():
+    # Background threads only. Returns the files and row digests that can be skipped right
+    # now; the index itself is read once and then kept in memory, and "rows" is a sorted
+    # uint64 array that is replaced, never modified in place
+    global import_index
+    with import_index_lock:
+        index = import_index
+    if index is None:
+        index = save_executor.submit(read_import_index).result()
+        with import_index_lock:
+            import_index = import_index or index
+            index = import_index
+    with staff_lock:
+        seq = change_seq
+    files = {file_hash for file_hash, file_seq in index["files"].items() if file_seq == seq}
+    rows = index["rows"]
+    return files, rows[np.isin(rows, current_row_digests())]
+
+
+def record_import(import_log):
+    # Tk thread, after the rows in import_log have been merged and saved
+    if not import_log["files"] and not len(import_log["rows"]):
+        return
+    seq = change_seq
+    with import_index_lock:
+        if import_index is not None:
+            import_index["files"].update(dict.fromkeys(import_log["files"], seq))
+            import_index["rows"] = np.union1d(import_index["rows"], import_log["rows"])
+    save_executor.submit(
+        append_import_index, dict(import_log["files"]), seq, import_log["row_names"], import_log["rows"]
+    ).add_done_callback(report_save_error)
+
+
+def forget_imported_staff(name):
+    # Tk thread, when a staff member is deleted; the in-memory index is read again next time
+    global import_index
+    with import_index_lock:
+        import_index = None
+    save_executor.submit(delete_import_rows, name).add_done_callback(report_save_error)
+
+
+def new_import_log():
+    return {"files": {}, "rows": np.empty(0, dtype=np.uint64), "row_names": np.empty(0, dtype=object),
+            "skipped_files": [], "skipped_rows": 0, "rejected_rows": 0, "rejected_path": None}
+
+
+def hash_import_file(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def drop_imported_rows(frame, known_rows, import_log):
+    # One hash per row, then a single vectorized membership test against the index
+    digests = row_digests(frame)
+    new = ~np.isin(digests, known_rows)
+    import_log["rows"] = np.concatenate([import_log["rows"], digests[new]])
+    import_log["row_names"] = np.concatenate([import_log["row_names"], frame["name"].to_numpy(dtype=object)[new]])
+    import_log["skipped_rows"] += len(frame) - int(new.sum())
+    return frame[new]
+
+
+def import_summary(imported_count, import_log):
+    message = f"Imported {imported_count} attendance records."
+    if import_log["skipped_rows"]:
+        message += f"\nSkipped {import_log['skipped_rows']} rows that were already imported."
+    if import_log["skipped_files"]:
+        message += "\nSkipped files already imported: " + ", ".join(import_log["skipped_files"])
+    if import_log["rejected_rows"]:
+        message += (f"\nRejected {import_log['rejected_rows']} invalid rows, "
+                    f"listed in {import_log['rejected_path']}")
+    return message
+
+
+def note_rejected_rows(rejected_rows, path, import_log):
+    write_rejected_rows(rejected_rows, path)
+    if len(rejected_rows):
+        import_log["rejected_rows"] += len(rejected_rows)
+        import_log["rejected_path"] = path
+
+
+def read_import_file(job, filepath):
+    # Runs in the background: parse, coerce and group only, staffList is left alone
+    import_log = new_import_log()
+    known_files, known_rows = load_import_index()
+    file_hash = hash_import_file(filepath)
+    if file_hash in known_files:
+        import_log["skipped_files"].append(os.path.basename(filepath))
+        return 0, {}, import_log
+    if is_csv_path(filepath):
+        df = pd.read_csv(filepath)
+    else:
+        df = pd.read_excel(filepath, engine="openpyxl")
+    job.progress(1, 3)
+    frame, rejected_rows = coerce_import_frame(df, import_known_names())
+    clear_rejected_rows(get_rejected_path(filepath))
+    note_rejected_rows(rejected_rows, get_rejected_path(filepath), import_log)
+    bonus = last_import_bonus(frame)
+    frame = drop_imported_rows(frame, known_rows, import_log)
+    import_log["files"][file_hash] = os.path.basename(filepath)
+    job.progress(2, 3)
+    return len(frame), group_import_frame(frame, bonus), import_log
+
+
+def merge_import(staff_updates):
+    # Tk thread only: merges grouped import updates into staffList, returns journal changes
+    changes = []
+    with staff_lock:
+        for name, update in staff_updates.items():
+            staff = staffList.get(name)
+            staff_changes = []
+            if not staff:
+                staff = new_staff_record()
+                staffList[name] = staff
+                search_index.add(name)
+                staff_changes.append(journal_set([name], staff))
+
+            if update["weeks"]:
+                staff_changes.extend(merge_staff_weeks(name, update["weeks"], update["months"]))
+
+            # Update bonus info, only where it differs from what is stored
+            bonus_info = staff.setdefault("bonus", {})
+            if "bonus" in update and (bonus_info.get("current_bonus"), bonus_info.get("current_chance")) != (
+                    update["bonus"], update["chance"]):
+                bonus_info["current_bonus"] = update["bonus"]
+                bonus_info["current_chance"] = update["chance"]
+                staff_changes.extend([
+                    journal_set([name, "bonus", "current_bonus"], update["bonus"]),
+                    journal_set([name, "bonus", "current_chance"], update["chance"])
+                ])
+            if staff_changes:
+                changes.extend(staff_changes)
+                changes.append(mark_changed(name))
+    return changes
+
+
+def apply_import(result):
+    # Runs on the Tk thread once read_import_file has finished
+    imported_count, staff_updates, import_log = result
+    changes = merge_import(staff_updates)
+    if changes:
+        save_staff(changes)
+        list_all_staff()
+    record_import(import_log)
+    messagebox.showinfo("Import Successful", import_summary(imported_count, import_log))
+
+
+# CSV and XLSX imports are streamed in chunks of IMPORT_CHUNK_ROWS. Each chunk is merged and
+# saved before the next is read, and the number of rows done is recorded per file,
+# so an interrupted import can pick up where it stopped.
+IMPORT_CHUNK_ROWS = 50000
 
-            if name and date:
-                staff = staffList.get(name)
-                if not staff:
-                    staff = {"name": name, "attendance": {}, "bonus": {}}
-                    staffList[name] = staff
 
-                staff.setdefault("attendance", {})[date] = {
-                    "scheduled": scheduled,
-                    "attended": attended,
-                    "tardiness": tardiness,
-                    "absent": absent
-                }
+def get_import_progress_path():
+    return os.path.splitext(get_data_path())[0] + "_import_progress.json"
 
-                # Update bonus info
-                bonus_info = staff.setdefault("bonus", {})
-                bonus_info["current_bonus"] = bonus
-                bonus_info["current_chance"] = chance
 
-                imported_count += 1
+def import_file_key(filepath):
+    # A changed file (size or mtime) does not resume from an old position
+    info = os.stat(filepath)
+    return f"{os.path.abspath(filepath)}|{info.st_size}|{int(info.st_mtime)}"
 
+
+def load_import_progress():
+    try:
+        with open(get_import_progress_path(), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_import_progress(key, rows_done):
+    # Runs on the save thread, queued right behind the save of the chunk it describes
+    progress = load_import_progress()
+    if rows_done is None:
+        progress.pop(key, None)
+    else:
+        progress[key] = rows_done
+    tmp_path = get_import_progress_path() + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(progress, f, indent=4)
+    os.replace(tmp_path, get_import_progress_path())
+
+
+def commit_import_chunk(staff_updates, key, rows_done, import_log):
+    changes = merge_import(staff_updates)
+    if changes:
+        save_staff(changes)
+    record_import(import_log)
+    save_executor.submit(save_import_progress, key, rows_done).add_done_callback(report_save_error)
+
+
+def iter_csv_chunks(filepath, start_row, chunk_rows=IMPORT_CHUNK_ROWS, **read_options):
+    # Yields (chunk, done, total) with progress measured in bytes read from disk
+    size = os.path.getsize(filepath)
+    stream, raw = open_import_binary(filepath)
+    with raw, stream:
+        # Row 0 is the header; already committed data rows are skipped without being merged
+        skip = (lambda i: 0 < i <= start_row) if start_row else None
+        reader = pd.read_csv(stream, chunksize=chunk_rows, skiprows=skip, **read_options)
+        for chunk in reader:
+            yield chunk, raw.tell(), size
+
+
+def iter_xlsx_chunks(filepath, start_row):
+    # Read-only mode streams the sheet XML row by row: no styles, no cell objects kept,
+    # no full workbook in memory. Progress is measured in rows; sheets written without
+    # a dimension record have no known row count, so only rows done are reported.
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(value) if value is not None else "" for value in next(rows, ())]
+        total = sheet.max_row - 1 if sheet.max_row else 0
+        rows_done = start_row
+        rows = itertools.islice(rows, start_row, None)
+        while True:
+            batch = list(itertools.islice(rows, IMPORT_CHUNK_ROWS))
+            if not batch:
+                break
+            rows_done += len(batch)
+            chunk = pd.DataFrame(batch).iloc[:, :len(header)]
+            chunk.columns = header[:chunk.shape[1]]
+            yield chunk, rows_done, total
+    finally:
+        workbook.close()
+
+
+def stream_import(job, filepath, key, start_row):
+    imported_count = 0
+    rows_done = start_row
+    summary_log = new_import_log()
+    known_files, known_rows = load_import_index()
+    file_hash = hash_import_file(filepath)
+    if file_hash in known_files:
+        summary_log["skipped_files"].append(os.path.basename(filepath))
+        return key, 0, summary_log
+    known_names = import_known_names()
+    rejected_path = get_rejected_path(filepath)
+    if not start_row:
+        clear_rejected_rows(rejected_path)
+    chunks = iter_csv_chunks if is_csv_path(filepath) else iter_xlsx_chunks
+    for chunk, done, total in chunks(filepath, start_row):
+        # Number rows by their position in the file so the rejected report can point at them
+        chunk.index = pd.RangeIndex(rows_done, rows_done + len(chunk))
+        import_log = new_import_log()
+        frame, rejected_rows = coerce_import_frame(chunk, known_names)
+        note_rejected_rows(rejected_rows, rejected_path, summary_log)
+        bonus = last_import_bonus(frame)
+        frame = drop_imported_rows(frame, known_rows, import_log)
+        summary_log["skipped_rows"] += import_log["skipped_rows"]
+        rows_done += len(chunk)
+        imported_count += len(frame)
+        job.run_on_ui(commit_import_chunk, group_import_frame(frame, bonus), key, rows_done, import_log)
+        job.progress(done, total)
+    # The file itself only counts as imported once every chunk is in
+    summary_log["files"][file_hash] = os.path.basename(filepath)
+    return key, imported_count, summary_log
+
+
+def finish_stream_import(result):
+    key, imported_count, import_log = result
+    save_executor.submit(save_import_progress, key, None).add_done_callback(report_save_error)
+    record_import(import_log)
+    if imported_count:
         list_all_staff()
-        messagebox.showinfo("Import Successful", f"Imported {imported_count} attendance records.")
-    except Exception as e:
-        messagebox.showerror("Import Failed", str(e))
+    messagebox.showinfo("Import Successful", import_summary(imported_count, import_log))
 
 
+def import_excel():
+    filepath = filedialog.askopenfilename(
+        title="Select File",
+        filetypes=[("CSV or Excel files", "*.csv *.csv.gz *.csv.zst *.xlsx *.xls")]
+    )
+    if not filepath:
+        return
 
-def add_staff(name):
-    name = name.strip()
-    if not name:
-        messagebox.showerror("Error", "Name cannot be empty.")
+    if is_csv_path(filepath) or filepath.endswith(".xlsx"):
+        key = import_file_key(filepath)
+        start_row = load_import_progress().get(key, 0)
+        if start_row and not messagebox.askyesno(
+            "Resume Import?",
+            f"An earlier import of this file stopped after {start_row} rows.\n"
+            f"Resume from there? (No starts over from the first row.)"
+        ):
+            start_row = 0
+        worker.submit("Import", stream_import, filepath, key, start_row, on_done=finish_stream_import)
+    else:
+        worker.submit("Import", read_import_file, filepath, on_done=apply_import)
+
+
+# Folder import: every staff_attendance_YYYYMMDD*.csv in a folder is parsed in its own
+# process, then merged oldest file first so the latest file wins per staff and week
+IMPORT_FILE_PATTERN = re.compile(r"^staff_attendance_(\d{8}).*\.csv(\.gz|\.zst)?$", re.IGNORECASE)
+
+
+def find_import_files(folder):
+    matches = []
+    for filename in os.listdir(folder):
+        match = IMPORT_FILE_PATTERN.match(filename)
+        if match:
+            matches.append((match.group(1), filename))
+    return [os.path.join(folder, filename) for _, filename in sorted(matches)]
+
+
+def parse_import_csv(filepath, known_files, known_rows, known_names):
+    # Runs in a worker process; must not touch staffList, the import index or Tk.
+    # Rejected rows come back in import_log and are written by the parent.
+    import_log = new_import_log()
+    import_log["rejected"] = pd.DataFrame()
+    file_hash = hash_import_file(filepath)
+    if file_hash in known_files:
+        import_log["skipped_files"].append(os.path.basename(filepath))
+        return 0, {}, import_log
+    frame, rejected_rows = coerce_import_frame(pd.read_csv(filepath), known_names)
+    rejected_rows.insert(0, "Source File", os.path.basename(filepath))
+    import_log["rejected"] = rejected_rows
+    bonus = last_import_bonus(frame)
+    frame = drop_imported_rows(frame, known_rows, import_log)
+    import_log["files"][file_hash] = os.path.basename(filepath)
+    return len(frame), group_import_frame(frame, bonus), import_log
+
+
+def combine_import_results(results):
+    # results are in file order, oldest first; later weeks and bonus values overwrite earlier ones
+    combined = {}
+    imported_count = 0
+    combined_log = new_import_log()
+    for count, staff_updates, import_log in results:
+        imported_count += count
+        combined_log["files"].update(import_log["files"])
+        combined_log["rows"] = np.concatenate([combined_log["rows"], import_log["rows"]])
+        combined_log["row_names"] = np.concatenate([combined_log["row_names"], import_log["row_names"]])
+        combined_log["skipped_files"] += import_log["skipped_files"]
+        combined_log["skipped_rows"] += import_log["skipped_rows"]
+        for name, update in staff_updates.items():
+            entry = combined.setdefault(name, {"weeks": {}})
+            entry["weeks"].update(update["weeks"])
+            if "bonus" in update:
+                entry["bonus"] = update["bonus"]
+                entry["chance"] = update["chance"]
+    for entry in combined.values():
+        months = defaultdict(lambda: dict.fromkeys(HOUR_COLUMNS, 0))
+        for week, hours in entry["weeks"].items():
+            if is_valid_date(week):
+                for key in HOUR_COLUMNS:
+                    months[week[:7]][key] += hours[key]
+        entry["months"] = dict(months)
+    return imported_count, combined, combined_log
+
+
+def read_import_folder(job, filepaths):
+    results = {}
+    known_files, known_rows = load_import_index()
+    known_names = import_known_names()
+    with ProcessPoolExecutor(max_workers=min(len(filepaths), os.cpu_count() or 1)) as pool:
+        futures = {pool.submit(parse_import_csv, path, known_files, known_rows, known_names): path
+                   for path in filepaths}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                job.progress(done, len(filepaths))
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+    results = [results[path] for path in filepaths]
+    # One report for the whole folder, with the file each row came from
+    rejected_path = os.path.join(os.path.dirname(filepaths[0]), "rejected_staff_attendance.csv")
+    clear_rejected_rows(rejected_path)
+    imported_count, combined, import_log = combine_import_results(results)
+    rejected = [log.pop("rejected") for _, _, log in results]
+    rejected_rows = pd.concat([rows for rows in rejected if len(rows)] or [pd.DataFrame()], ignore_index=True)
+    note_rejected_rows(rejected_rows, rejected_path, import_log)
+    return imported_count, combined, import_log
+
+
+def import_folder():
+    folder = filedialog.askdirectory(title="Select Folder")
+    if not folder:
         return
-    if name in staffList:
-        messagebox.showerror("Error", "Staff already exists.")
+    filepaths = find_import_files(folder)
+    if not filepaths:
+        messagebox.showerror("Import Failed", "No staff_attendance_YYYYMMDD.csv files found in that folder.")
         return
-    staffList[name] = {
+    # apply_import merges everything and saves once
+    worker.submit("Import", read_import_folder, filepaths, on_done=apply_import)
+
+
+# Punch-clock logs: one row per clock event (Name, Timestamp, Event = in/out). Events are
+# paired per staff and day, measured against the shift below and rolled up into the
+# same week keys as record_attendance. A week found in a log replaces that week's hours,
+# so each log should cover whole weeks.
+SHIFT_START_HOUR = 9
+SHIFT_HOURS = 8
+WORK_DAYS = 5  # Monday to Friday
+PUNCH_CHUNK_ROWS = 500000
+PUNCH_EVENTS = {"in": True, "clock in": True, "out": False, "clock out": False}
+PUNCH_COLUMNS = ["Name", "Timestamp", "Event"]
+
+
+def coerce_punch_frame(df, known_names=None):
+    # Same contract as coerce_import_frame: (events that pass, original rows that fail)
+    events = pd.DataFrame({"row": df.index}, index=df.index)
+    failures = {}
+    names = df["Name"] if "Name" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    has_name = names.notna() & (names.astype(str).str.strip() != "")
+    failures["missing name"] = ~has_name
+    events["name"] = names.astype(str)
+    if known_names is not None:
+        failures["unknown staff"] = has_name & ~events["name"].isin(known_names)
+    stamps = df["Timestamp"] if "Timestamp" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    events["time"] = pd.to_datetime(stamps, format="ISO8601", errors="coerce")
+    failures["invalid timestamp"] = events["time"].isna()
+    kinds = df["Event"] if "Event" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    events["is_in"] = kinds.astype(str).str.strip().str.lower().map(PUNCH_EVENTS)
+    failures["event is not in/out"] = events["is_in"].isna()
+
+    failed = pd.DataFrame(failures)
+    rejected = failed.any(axis=1)
+    events = events[~rejected].astype({"is_in": bool})
+    # Only the punch columns are reported, so every chunk's report rows line up
+    return events, reject_rows(df.reindex(columns=PUNCH_COLUMNS), failed, rejected)
+
+
+def note_unmatched_punches(unmatched, rejected_path, import_log):
+    rejected_rows = pd.DataFrame({
+        "Name": unmatched["name"],
+        "Timestamp": unmatched["time"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "Event": np.where(unmatched["is_in"], "in", "out"),
+        "Source Row": unmatched["row"] + 2,
+        "Rejected Reason": np.where(unmatched["is_in"], "in without a matching out", "out without a matching in")
+    })
+    note_rejected_rows(rejected_rows, rejected_path, import_log)
+
+
+def pair_punch_days(events):
+    # events hold whole staff-days only. Each "in" directly followed by an "out" of the
+    # same staff and day is one worked interval; anything else is an unmatched punch.
+    events = events.sort_values(["name", "time"], kind="stable")
+    day = events["time"].dt.normalize()
+    next_same_day = (events["name"] == events["name"].shift(-1)) & (day == day.shift(-1))
+    is_in = events["is_in"]
+    pair_start = is_in & ~is_in.shift(-1, fill_value=True) & next_same_day
+    pair_end = pair_start.shift(1, fill_value=False)
+    unmatched = events[~(pair_start | pair_end)]
+
+    shift_start = day[pair_start] + pd.Timedelta(hours=SHIFT_START_HOUR)
+    shift_end = shift_start + pd.Timedelta(hours=SHIFT_HOURS)
+    start = events["time"][pair_start]
+    end = events["time"].shift(-1)[pair_start]
+    worked = (np.minimum(end, shift_end) - np.maximum(start, shift_start)).clip(lower=pd.Timedelta(0))
+    intervals = pd.DataFrame({
+        "name": events["name"][pair_start],
+        "day": day[pair_start],
+        "attended": worked.dt.total_seconds() / 3600,
+        "first_in": start,
+    })
+    days = intervals.groupby(["name", "day"], sort=False).agg(attended=("attended", "sum"),
+                                                               first_in=("first_in", "min")).reset_index()
+    days = days[days["day"].dt.dayofweek < WORK_DAYS]
+    # Late only counts on days something of the shift was worked; otherwise the day is absent
+    late = (days["first_in"] - days["day"] - pd.Timedelta(hours=SHIFT_START_HOUR)).dt.total_seconds() / 3600
+    days["tardiness"] = np.where(days["attended"] > 0, late.clip(0, SHIFT_HOURS), 0.0)
+    return days[["name", "day", "attended", "tardiness"]], unmatched
+
+
+def punch_week_key(times):
+    return (times.dt.normalize() - pd.to_timedelta(times.dt.dayofweek, unit="D")).dt.strftime("%Y-%m-%d")
+
+
+def punch_weeks(days, spans, first_day, last_day):
+    # Every workday between the first and last day in the log is scheduled, but for each staff
+    # only in the weeks from their own first to last punch (spans: first/last time by name),
+    # so a new hire, a leaver or a partial export leaves that staff's other weeks alone.
+    # Unworked scheduled time that is not tardiness is absence
+    workdays = pd.date_range(first_day, last_day)
+    workdays = workdays[workdays.dayofweek < WORK_DAYS]
+    weeks = pd.Series(workdays - pd.to_timedelta(workdays.dayofweek, unit="D")).dt.strftime("%Y-%m-%d")
+    scheduled = (weeks.value_counts() * float(SHIFT_HOURS)).rename("scheduled").rename_axis("week").reset_index()
+    spans = spans.sort_index()
+    frame = pd.DataFrame({
+        "name": spans.index,
+        "first_week": punch_week_key(spans["first"]).to_numpy(),
+        "last_week": punch_week_key(spans["last"]).to_numpy()
+    }).merge(scheduled, how="cross")
+    frame = frame[(frame["week"] >= frame["first_week"]) & (frame["week"] <= frame["last_week"])]
+
+    days = days.assign(week=(days["day"] - pd.to_timedelta(days["day"].dt.dayofweek, unit="D"))
+                       .dt.strftime("%Y-%m-%d"))
+    worked = days.groupby(["name", "week"])[["attended", "tardiness"]].sum().reset_index()
+    frame = frame.merge(worked, on=["name", "week"], how="left").fillna({"attended": 0.0, "tardiness": 0.0})
+    frame["attended"] = frame["attended"].round(4)
+    frame["tardiness"] = frame["tardiness"].round(4)
+    frame["absent"] = (frame["scheduled"] - frame["attended"] - frame["tardiness"]).round(4)
+    return frame[["name", "week"] + HOUR_COLUMNS]
+
+
+def ingest_punch_log(job, filepath):
+    # One pass over the log in chunks. Logs are expected in time order: the last day of
+    # each chunk is carried into the next, and every earlier day is closed and paired.
+    import_log = new_import_log()
+    known_files, _ = load_import_index()
+    file_hash = hash_import_file(filepath)
+    if file_hash in known_files:
+        import_log["skipped_files"].append(os.path.basename(filepath))
+        return 0, {}, import_log
+    known_names = import_known_names()
+    rejected_path = get_rejected_path(filepath)
+    clear_rejected_rows(rejected_path)
+
+    day_frames = []
+    spans = None
+    first_day = last_day = None
+    carry = None
+    rows_done = 0
+    event_count = 0
+    for chunk, done, total in iter_csv_chunks(filepath, 0, PUNCH_CHUNK_ROWS, dtype=str):
+        chunk.index = pd.RangeIndex(rows_done, rows_done + len(chunk))
+        rows_done += len(chunk)
+        events, rejected_rows = coerce_punch_frame(chunk, known_names)
+        if last_day is not None:
+            late = events["time"] < last_day
+            if late.any():
+                failed = pd.DataFrame({"day already closed, log is not in time order": late})
+                late_rows = reject_rows(chunk.loc[events.index].reindex(columns=PUNCH_COLUMNS), failed, late)
+                rejected_rows = pd.concat([rejected_rows, late_rows])
+                events = events[~late]
+        note_rejected_rows(rejected_rows, rejected_path, import_log)
+        job.progress(done, total)
+        if not len(events):
+            continue
+        event_count += len(events)
+        span = events.groupby("name")["time"].agg(first="min", last="max")
+        spans = span if spans is None else pd.concat([spans, span]).groupby(level=0).agg(first=("first", "min"),
+                                                                                          last=("last", "max"))
+        if carry is not None:
+            events = pd.concat([carry, events])
+        day = events["time"].dt.normalize()
+        first_day = day.min() if first_day is None else first_day
+        last_day = day.max()
+        closed = day < last_day
+        carry = events[~closed]
+        if closed.any():
+            days, unmatched = pair_punch_days(events[closed])
+            day_frames.append(days)
+            note_unmatched_punches(unmatched, rejected_path, import_log)
+    if carry is not None:
+        days, unmatched = pair_punch_days(carry)
+        day_frames.append(days)
+        note_unmatched_punches(unmatched, rejected_path, import_log)
+
+    if spans is None:
+        return 0, {}, import_log
+    frame = punch_weeks(pd.concat(day_frames, ignore_index=True), spans, first_day, last_day)
+    import_log["files"][file_hash] = os.path.basename(filepath)
+    return event_count, group_import_frame(frame), import_log
+
+
+def import_punches():
+    filepath = filedialog.askopenfilename(
+        title="Select Punch-Clock Log",
+        filetypes=[("CSV files", "*.csv *.csv.gz *.csv.zst")]
+    )
+    if not filepath:
+        return
+    worker.submit("Import", ingest_punch_log, filepath, on_done=apply_import)
+
+
+def new_staff_record():
+    # The shape every staff record starts with, whether added by hand or by an import
+    return {
         "attendance": {},
+        "monthly_stats": {},
         "bonus": {
             "current_bonus": 0, 
             "current_chance": 0, 
@@ -458,7 +2454,21 @@ def add_staff(name):
         },
         "lastUpdate": datetime.now().strftime("%Y-%m-%d %H:%M")
     }
-    save_staff()
+
+
+def add_staff(name):
+    name = name.strip()
+    if not name:
+        messagebox.showerror("Error", "Name cannot be empty.")
+        return
+    if name in staffList:
+        messagebox.showerror("Error", "Staff already exists.")
+        return
+    with staff_lock:
+        staffList[name] = new_staff_record()
+        mark_changed(name)
+    search_index.add(name)
+    save_staff([journal_set([name], staffList[name])])
     messagebox.showinfo("Added", f"{name} has been added.")
     new_entry.delete(0, tk.END)
     toggle_add_frame()
@@ -478,9 +2488,17 @@ def delete_staff(name):
         return
     confirm = messagebox.askyesno("Delete Staff", f"Are you sure you want to delete {name}?")
     if confirm:
-        del staffList[name]
-        save_staff()
-        clear_table()
+        with staff_lock:
+            del staffList[name]
+            # Remembered so the next delta export can report the removal; queued under
+            # the lock so a delta export that sees the new sequence number sees this too
+            save_executor.submit(record_deleted_staff, name, next_change_seq()).add_done_callback(report_save_error)
+        search_index.remove(name)
+        save_staff([journal_delete([name])])
+        forget_imported_staff(name)
+        table.remove_row(name)
+        global current_name
+        current_name = ""
         update_btn("disabled")
         messagebox.showinfo("Deleted", f"{name} has been removed.")
 
@@ -488,51 +2506,135 @@ def on_row_select(event):
     selected = tree.selection()
     if not selected:
         return
-    item = tree.item(selected[0])
-    name = item["values"][0]
+    row = table.row_for(selected[0])
+    if row is None:
+        return
+    name = row[0]
     if name in staffList:
         global current_name
         current_name = name
         update_btn("normal")
+        suggest_perfect(name, bonus_month())
 
 
-bonusList = [20, 40, 50]
-def calculate_bonus_logic(staff, perfect_attendance):
-    current_bonus = staff["bonus"].get("current_bonus", 0)
-    current_chance = staff["bonus"].get("current_chance", 0)
+def bonus_month():
+    # The month Calculate Bonus and Run Month Bonuses record for, and that the checkbox is
+    # suggested from; the table may be showing another month after Record Attendance
+    return month_var.get() or datetime.now().strftime("%Y-%m")
 
-    if perfect_attendance:
-        if current_bonus == 50:
-            current_bonus = 20
-            current_chance += 1
-        else:
-            next_index = bonusList.index(current_bonus) + 1
-            current_bonus = bonusList[next_index]
-    else:
-        if current_chance > 0:
-            current_chance -= 1
-        else:
-            current_bonus = 0
 
+def suggest_perfect(name, month):
+    # Pre-ticks the checkbox from the month's totals; it can still be changed before Calculate Bonus
+    totals = get_month_stat(name, month)
+    perfect_var.set(bool(perfect_attendance_rule(
+        totals.get("scheduled", 0), totals.get("tardiness", 0), totals.get("absent", 0)
+    )))
+
+
+bonusList = [20, 40, 50]
+def calculate_bonus_logic(staff, perfect_attendance):
+    current_bonus, current_chance = next_bonus_step(
+        staff["bonus"].get("current_bonus", 0), staff["bonus"].get("current_chance", 0), perfect_attendance
+    )
     staff["bonus"]["current_bonus"] = current_bonus
     staff["bonus"]["current_chance"] = current_chance
 
+
+def next_bonus_step(bonus, chance, perfect):
+    # One month of the ladder: a perfect month moves 0 -> 20 -> 40 -> 50, and from 50 back
+    # to 20 with an extra chance; an imperfect month uses up a chance, or loses the bonus
+    if perfect:
+        if bonus == 0:
+            return bonusList[0], chance
+        if bonus >= bonusList[-1]:
+            return bonusList[0], chance + 1
+        return bonusList[bisect.bisect_right(bonusList, bonus)], chance
+    if chance > 0:
+        return bonus, chance - 1
+    return 0, chance
+
+
+def replay_bonus_months(name, month):
+    # Tk thread, under staff_lock. Each bonus_history entry is the state after that month,
+    # so a change to `month` replays the ladder from the nearest earlier checkpoint through
+    # the last recorded month instead of the whole chain. Before the first recorded month
+    # the checkpoint is "bonusStart", the bonus the staff had then (imported or older data).
+    # Only months whose result changed are journaled
+    staff = staffList[name]
+    bonus_info = staff["bonus"]
+    bonus_history = bonus_info.setdefault("bonus_history", {})
+    months = sorted(bonus_info["bonus_updated"])
+    start = bisect.bisect_left(months, month)
+    while start > 0 and not bonus_history.get(months[start - 1]):
+        start -= 1
+    checkpoint = bonus_history[months[start - 1]] if start > 0 else staff.get("bonusStart", {})
+    bonus, chance = checkpoint.get("bonus", 0), checkpoint.get("chance", 0)
+
+    changes = []
+    for replay_month in months[start:]:
+        bonus, chance = next_bonus_step(bonus, chance, bonus_info["bonus_updated"][replay_month])
+        state = {"bonus": bonus, "chance": chance}
+        if bonus_history.get(replay_month) != state:
+            bonus_history[replay_month] = state
+            changes.append(journal_set([name, "bonus", "bonus_history", replay_month], state))
+    if (bonus_info.get("current_bonus"), bonus_info.get("current_chance")) != (bonus, chance):
+        bonus_info["current_bonus"] = bonus
+        bonus_info["current_chance"] = chance
+        changes.extend([
+            journal_set([name, "bonus", "current_bonus"], bonus),
+            journal_set([name, "bonus", "current_chance"], chance)
+        ])
+    return changes
+
+
+def record_bonus_month(name, month, perfect):
+    # Tk thread, under staff_lock. Records the month's status and its bonus; a month recorded
+    # before keeps its old result in overwrite_log. The newest month steps on from the current
+    # bonus, anything else replays from that month forward. Returns the journal changes.
+    bonus_info = staffList[name].setdefault("bonus", {})
+    bonus_history = bonus_info.setdefault("bonus_history", {})
+    bonus_updated = bonus_info.setdefault("bonus_updated", {})
+    changes = [mark_changed(name)]
+    overwrite = month in bonus_updated
+    if overwrite and bonus_history.get(month):
+        old_records = bonus_info.setdefault("overwrite_log", {}).setdefault(month, [])
+        old_records.append(bonus_history[month])
+        changes.append(journal_set([name, "bonus", "overwrite_log", month], old_records))
+
+    if not bonus_updated:
+        # Where the replay starts from when every recorded month is replayed
+        staffList[name]["bonusStart"] = {"bonus": bonus_info.get("current_bonus", 0),
+                                          "chance": bonus_info.get("current_chance", 0)}
+        changes.append(journal_set([name, "bonusStart"], staffList[name]["bonusStart"]))
+    newest = not bonus_updated or month > max(bonus_updated)
+    bonus_updated[month] = perfect  # <-- store true/false
+    changes.append(journal_set([name, "bonus", "bonus_updated", month], perfect))
+    if overwrite or not newest:
+        changes.extend(replay_bonus_months(name, month))
+        return changes
+
+    bonus, chance = next_bonus_step(bonus_info.get("current_bonus", 0), bonus_info.get("current_chance", 0), perfect)
+    bonus_info["current_bonus"] = bonus
+    bonus_info["current_chance"] = chance
+    bonus_history[month] = {"bonus": bonus, "chance": chance}
+    changes.extend([
+        journal_set([name, "bonus", "current_bonus"], bonus),
+        journal_set([name, "bonus", "current_chance"], chance),
+        journal_set([name, "bonus", "bonus_history", month], bonus_history[month])
+    ])
+    return changes
+
+
 def calculate_bonus_popup():
     if not current_name or current_name not in staffList:
         return
 
     staff = staffList[current_name]
     # now_month = datetime.now().strftime("%Y-%m")
-    selected_month = month_var.get()  # e.g., "2025-04"
+    selected_month = bonus_month()  # e.g., "2025-04"
     
 
-    # Get or initialize bonus info
-    bonus_info = staff.get("bonus", {})
-    bonus_updated = bonus_info.get("bonus_updated", {})
-    current_bonus = bonus_info.get("current_bonus", 0)
-    current_chance = bonus_info.get("current_chance", 0)
-    bonus_history = bonus_info.setdefault("bonus_history", {})
-    overwrite_log = bonus_info.setdefault("overwrite_log", {})
+    bonus_updated = staff.get("bonus", {}).get("bonus_updated", {})
 
     new_perfect = perfect_var.get()
     
@@ -555,63 +2657,88 @@ def calculate_bonus_popup():
             )
             if not overwrite: 
                 return # Cancel if user don't want to overwrite
-            
-            # save old record before overwriting
-            old_record = bonus_history.get(selected_month)
-            if old_record: 
-                overwrite_log.setdefault(selected_month, []).append(old_record)
-                
-
-
-    # Check if checkbox was checked for perfect attendance
-    if new_perfect:
-        # for new staff
-        if current_bonus == 0: 
-            current_bonus = 20
-            print(f"test: {current_name}'s current bonus is {current_bonus}")
-        else: 
-            if current_bonus == 50:
-                current_bonus = 20
-                current_chance += 1
-            else:
-                next_index = bonusList.index(current_bonus) + 1
-                current_bonus = bonusList[next_index]
-    else:
-        # Assume imperfect attendance
-        if current_chance > 0:
-            current_chance -= 1
-        else:
-            current_bonus = 0
-
-    # Save bonus info
-    bonus_updated[selected_month] = new_perfect # <-- store true/false
-    bonus_history[selected_month] = {
-        "bonus": current_bonus, 
-        "chance": current_chance
-    }
-    staff["bonus"] = {
-        "current_bonus": current_bonus,
-        "current_chance": current_chance,
-        "bonus_history": bonus_history, 
-        "bonus_updated": bonus_updated,
-        "overwrite_log": overwrite_log
-    }
 
-    save_staff()
-    show_staff(current_name)
+    # Apply the bonus ladder; an earlier month also recomputes the months after it
+    with staff_lock:
+        changes = record_bonus_month(current_name, selected_month, new_perfect)
+    current_bonus = staff["bonus"]["current_bonus"]
+    current_chance = staff["bonus"]["current_chance"]
+    save_staff(changes)
+    if not refresh_staff_row(current_name, selected_month):
+        show_staff(current_name)
 
     # Show popup
     messagebox.showinfo("Bonus Updated", f"Current Bonus: {current_bonus}\nCurrent Chance: {current_chance}")
 
 
+def run_month_bonuses():
+    # Whole roster for the selected month, judged by detect_perfect_attendance.
+    # Staff with nothing scheduled are skipped, and so are months already recorded with
+    # the same status; a different earlier status is replaced only if the user agrees once
+    selected_month = bonus_month()
+    pending = []
+    conflicts = 0
+    with staff_lock:
+        detected = detect_perfect_attendance(selected_month)
+        skipped = len(staffList) - len(detected)
+        for name, perfect in zip(detected.index.tolist(), detected.tolist()):
+            recorded = staffList[name].get("bonus", {}).get("bonus_updated", {})
+            if selected_month in recorded:
+                if recorded[selected_month] == perfect:
+                    skipped += 1
+                    continue
+                conflicts += 1
+            pending.append((name, perfect, selected_month in recorded))
+
+    if conflicts and not messagebox.askyesno(
+        "Replace Bonus Records?",
+        f"{conflicts} staff already have a bonus for {selected_month} with a different attendance status.\n"
+        f"Do you want to replace them?"
+    ):
+        skipped += conflicts
+        pending = [entry for entry in pending if not entry[2]]
+
+    if not pending:
+        messagebox.showinfo("Bonus Run", f"No bonuses to record for {selected_month}.")
+        return
+
+    changes = []
+    with staff_lock:
+        for name, perfect, _ in pending:
+            if name in staffList:
+                changes.extend(record_bonus_month(name, selected_month, perfect))
+    save_staff(changes)
+    update_table()
+
+    perfect_count = sum(1 for _, perfect, _ in pending if perfect)
+    messagebox.showinfo(
+        "Bonus Run",
+        f"Bonuses recorded for {selected_month}: {len(pending)} staff "
+        f"({perfect_count} perfect, {len(pending) - perfect_count} imperfect).\n"
+        f"Skipped: {skipped}"
+    )
+
+
+table_job = {"job": None}
+
+
+def cancel_table_job():
+    if table_job["job"] is not None:
+        table_job["job"].cancel()
+        table_job["job"] = None
+
+
+def build_month_view(job, month):
+    with staff_lock:
+        return month_view_rows(month)
+
+
 # Update the whole table after selecting specific month
 def update_table(): 
-    clear_table()
     selected_month = month_var.get()
     if not selected_month:
         print("no month selected")
-        list_all_staff()  # If no month selected, show all staff
-        return
+        selected_month = datetime.now().strftime("%Y-%m")
     
     if current_name: 
         print("now is ", selected_month)
@@ -620,112 +2747,131 @@ def update_table():
         # now just showing the staff info for the current month
 
     else: 
-        for name, staff_data in sorted(staffList.items()):
-            monthly_stats = calc_monthly_stats(staff_data.get("attendance", {}))
-            month_stat = monthly_stats.get(selected_month, {})
-            bonus_info = staff_data.get("bonus", {})
-        
-            bonus = bonus_info["current_bonus"]
-            chance = bonus_info["current_chance"]
-            scheduled = month_stat.get("scheduled", 0)
-            attended = month_stat.get("attended", 0)
-            tardiness = month_stat.get("tardiness", 0)
-            absent = month_stat.get("absent", 0)
-            attendance_pct = round((attended / scheduled * 100) if scheduled else 0, 2)
-
-            tree.insert("", "end", values=(
-                name,
-                bonus, 
-                chance, 
-                scheduled,
-                attended,
-                tardiness,
-                absent,
-                f"{attendance_pct}%",
-                staff_data.get("lastUpdate", "N/A")
-            ))
-
-
-# === GUI Layout ===
-root = tk.Tk()
-root.title("Staff Monthly Attendance")
-root.geometry("800x500")
-
-frame_search = tk.Frame(root)
-frame_search.pack(pady=10)
-tk.Label(frame_search, text="Enter Staff Name:").pack(side=tk.LEFT)
-entry = tk.Entry(frame_search)
-entry.pack(side=tk.LEFT, padx=5)
-entry.bind("<Return>", lambda event: find_staff())
-tk.Button(frame_search, text="Find", command=find_staff).pack(side=tk.LEFT)
-
-# Buttons of basic functions
-frame_controls = tk.Frame(root)
-frame_controls.pack(pady=5)
-tk.Button(frame_controls, text="List All", command=list_all_staff).pack(side=tk.LEFT, padx=5)
-tk.Button(frame_controls, text="Add Staff", command=toggle_add_frame).pack(side=tk.LEFT, padx=5)
-tk.Button(frame_controls, text="Export to Excel", command=export_to_excel).pack(side=tk.LEFT, padx=5)
-tk.Button(frame_controls, text="Import Excel", command=import_excel).pack(side=tk.LEFT, pady=5)
-frame_bonus = tk.Frame(root)
-frame_bonus.pack(pady=5)
-perfect_var = tk.BooleanVar()
-perfect_check = tk.Checkbutton(frame_bonus, text="Perfect Attendance", variable=perfect_var)
-perfect_check.pack(side="left", padx=5) 
-bonusBtn = tk.Button(frame_bonus, text="Calculate Bonus", command=calculate_bonus_popup)
-bonusBtn.pack(side="left", padx=5)
-
-
-frame_add = tk.Frame(root)
-frame_add_visible = False
-tk.Label(frame_add, text="New Staff Name:").pack(side=tk.LEFT)
-new_entry = tk.Entry(frame_add)
-new_entry.pack(side=tk.LEFT, padx=5)
-new_entry.bind("<Return>", lambda event: add_staff(new_entry.get()))
-tk.Button(frame_add, text="Confirm", command=lambda: add_staff(new_entry.get())).pack(side=tk.LEFT)
-
-# Month selector
-month_var = tk.StringVar()
-month_choices = [f"{y}-{m:02d}" for y in range(2023, 2026) for m in range(1, 13)]
-month_var.set(datetime.now().strftime("%Y-%m"))
-month_dropdown = ttk.Combobox(frame_controls, textvariable=month_var, values=month_choices, state="readonly", width=10)
-month_dropdown.pack(side=tk.LEFT, padx=5)
-month_dropdown.bind("<<ComboboxSelected>>", lambda e: update_table())
-
-
-
-frame_tree = tk.Frame(root)
-frame_tree.pack(pady=15, fill="both", expand=True)
-
-# Treeview
-columns = ("Name", "Bonus", "Chance", "Schedule Hrs", "Attended Hrs", "Total Tardiness", "Total Absence", "Attendance %", "Last Updated")
-tree = ttk.Treeview(frame_tree, columns=columns, show="headings", xscrollcommand=lambda *args: h_scroll.set(*args))
-
-# Setup headings and column widths
-for col in columns:
-    tree.heading(col, text=col)
-    tree.column(col, anchor=tk.CENTER, width=120)
-
-# Horizontal scrollbar
-h_scroll = tk.Scrollbar(frame_tree, orient="horizontal", command=tree.xview)
-h_scroll.pack(side="bottom", fill="x")
-
-# Vertical scrollbar
-v_scroll = tk.Scrollbar(frame_tree, orient="vertical", command=tree.yview)
-v_scroll.pack(side="right", fill="y")
-tree.configure(yscrollcommand=v_scroll.set)
-
-# Pack Treeview last so it fills remaining space
-tree.pack(side="left", fill="both", expand=True)
-
-# Bind row selection event
-tree.bind("<<TreeviewSelect>>", on_row_select)
-
-# Actions buttons at the buttom
-frame_actions = tk.Frame(root)
-frame_actions.pack(pady=10)
-recordBtn = tk.Button(frame_actions, text="Record Attendance", command=record_attendance, state="disabled")
-deleteBtn = tk.Button(frame_actions, text="Delete", command=lambda: delete_staff(current_name), state="disabled")
-recordBtn.pack(side=tk.LEFT, padx=10)
-deleteBtn.pack(side=tk.LEFT, padx=10)
-
-root.mainloop()
+        # Built in the background; a newer request or a direct render cancels this one
+        cancel_table_job()
+
+        def on_done(rows, month=selected_month):
+            table_job["job"] = None
+            render_rows(rows, month)
+
+        table_job["job"] = worker.submit("Loading table", build_month_view, selected_month, on_done=on_done)
+
+
+# === Startup ===
+# Guarded so the import worker processes (which re-import this file on Windows)
+# do not load the data or open a window
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    staffList = load_staff()
+    ensure_monthly_cache()
+    init_change_seq()
+    search_index = StaffSearchIndex(staffList)
+
+    # === GUI Layout ===
+    root = tk.Tk()
+    root.title("Staff Monthly Attendance")
+    root.geometry("800x500")
+
+    frame_search = tk.Frame(root)
+    frame_search.pack(pady=10)
+    tk.Label(frame_search, text="Enter Staff Name:").pack(side=tk.LEFT)
+    entry = tk.Entry(frame_search)
+    entry.pack(side=tk.LEFT, padx=5)
+    entry.bind("<Return>", lambda event: find_staff())
+    entry.bind("<KeyRelease>", schedule_live_search)
+    tk.Button(frame_search, text="Find", command=find_staff).pack(side=tk.LEFT)
+
+    # Buttons of basic functions
+    frame_controls = tk.Frame(root)
+    frame_controls.pack(pady=5)
+    tk.Button(frame_controls, text="List All", command=list_all_staff).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_controls, text="Add Staff", command=toggle_add_frame).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_controls, text="Export to Excel", command=export_to_excel).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_controls, text="Export Changes", command=export_changes).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_controls, text="Import Excel", command=import_excel).pack(side=tk.LEFT, pady=5)
+    tk.Button(frame_controls, text="Import Folder", command=import_folder).pack(side=tk.LEFT, padx=5)
+    tk.Button(frame_controls, text="Import Punches", command=import_punches).pack(side=tk.LEFT, padx=5)
+    frame_bonus = tk.Frame(root)
+    frame_bonus.pack(pady=5)
+    perfect_var = tk.BooleanVar()
+    perfect_check = tk.Checkbutton(frame_bonus, text="Perfect Attendance", variable=perfect_var)
+    perfect_check.pack(side="left", padx=5) 
+    bonusBtn = tk.Button(frame_bonus, text="Calculate Bonus", command=calculate_bonus_popup)
+    bonusBtn.pack(side="left", padx=5)
+    tk.Button(frame_bonus, text="Run Month Bonuses", command=run_month_bonuses).pack(side="left", padx=5)
+
+
+    frame_add = tk.Frame(root)
+    frame_add_visible = False
+    tk.Label(frame_add, text="New Staff Name:").pack(side=tk.LEFT)
+    new_entry = tk.Entry(frame_add)
+    new_entry.pack(side=tk.LEFT, padx=5)
+    new_entry.bind("<Return>", lambda event: add_staff(new_entry.get()))
+    tk.Button(frame_add, text="Confirm", command=lambda: add_staff(new_entry.get())).pack(side=tk.LEFT)
+
+    # Month selector
+    month_var = tk.StringVar()
+    month_choices = [f"{y}-{m:02d}" for y in range(2023, 2026) for m in range(1, 13)]
+    month_var.set(datetime.now().strftime("%Y-%m"))
+    month_dropdown = ttk.Combobox(frame_controls, textvariable=month_var, values=month_choices, state="readonly", width=10)
+    month_dropdown.pack(side=tk.LEFT, padx=5)
+    month_dropdown.bind("<<ComboboxSelected>>", lambda e: update_table())
+
+
+
+    frame_tree = tk.Frame(root)
+    frame_tree.pack(pady=15, fill="both", expand=True)
+
+    # Treeview
+    columns = ("Name", "Bonus", "Chance", "Schedule Hrs", "Attended Hrs", "Total Tardiness", "Total Absence", "Attendance %", "Last Updated")
+    tree = ttk.Treeview(frame_tree, columns=columns, show="headings", xscrollcommand=lambda *args: h_scroll.set(*args))
+
+    # Setup headings and column widths
+    for col in columns:
+        tree.heading(col, text=col)
+        tree.column(col, anchor=tk.CENTER, width=120)
+
+    # Horizontal scrollbar
+    h_scroll = tk.Scrollbar(frame_tree, orient="horizontal", command=tree.xview)
+    h_scroll.pack(side="bottom", fill="x")
+
+    # Vertical scrollbar, driven by the virtual table rather than the tree itself
+    v_scroll = tk.Scrollbar(frame_tree, orient="vertical")
+    v_scroll.pack(side="right", fill="y")
+    table = VirtualTable(tree, v_scroll)
+
+    # Pack Treeview last so it fills remaining space
+    tree.pack(side="left", fill="both", expand=True)
+
+    # Bind row selection event
+    tree.bind("<<TreeviewSelect>>", on_row_select)
+
+    # Actions buttons at the buttom
+    frame_actions = tk.Frame(root)
+    frame_actions.pack(pady=10)
+    recordBtn = tk.Button(frame_actions, text="Record Attendance", command=record_attendance, state="disabled")
+    deleteBtn = tk.Button(frame_actions, text="Delete", command=lambda: delete_staff(current_name), state="disabled")
+    recordBtn.pack(side=tk.LEFT, padx=10)
+    deleteBtn.pack(side=tk.LEFT, padx=10)
+
+    # Status bar for background jobs
+    frame_status = tk.Frame(root)
+    frame_status.pack(side="bottom", fill="x", padx=10, pady=(0, 5))
+    status_var = tk.StringVar(value="Ready")
+    tk.Label(frame_status, textvariable=status_var, anchor="w").pack(side=tk.LEFT, fill="x", expand=True)
+    tk.Button(frame_status, text="Cancel", command=lambda: worker.cancel_all()).pack(side=tk.RIGHT)
+    progress_bar = ttk.Progressbar(frame_status, length=200)
+    progress_bar.pack(side=tk.RIGHT, padx=5)
+    worker = BackgroundWorker(root, status_var, progress_bar)
+
+
+    def on_close():
+        # Let queued saves reach the disk before the window goes away
+        worker.shutdown()
+        root.destroy()
+
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+    root.mainloop()